@@ -3,27 +3,158 @@ Database setup and session management for the Finance Tracker application.
 Updated to include portfolio tracking tables.
 """
 
-from sqlalchemy import create_engine, Column, Integer, String, Float, Date, Boolean, DateTime, Table, MetaData, text
+from sqlalchemy import create_engine, event, insert, Column, Integer, String, Float, Date, Boolean, DateTime, LargeBinary, Table, text
+from sqlalchemy.types import TypeDecorator
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import QueuePool
+from sqlalchemy.schema import CreateTable
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from datetime import datetime
+from decimal import Decimal, ROUND_HALF_UP
+from contextlib import contextmanager
+import hashlib
+import logging
+
+logger = logging.getLogger(__name__)
 
 # Database setup
 DB_NAME = 'finances.db'
 DB_URL = f'sqlite:///{DB_NAME}'
-engine = create_engine(DB_URL)
+# Bump whenever init_database changes the schema; stored in PRAGMA user_version
+SCHEMA_VERSION = 13
+# Schema version that switched monetary columns from REAL dollars to INTEGER cents
+CENTS_SCHEMA_VERSION = 11
+# Schema version that switched transaction hashes from hex TEXT to raw BLOB digests
+HASH_BLOB_SCHEMA_VERSION = 13
+engine = create_engine(
+    DB_URL,
+    connect_args={"check_same_thread": False},
+    poolclass=QueuePool,
+    pool_size=5,
+    max_overflow=10,
+    pool_pre_ping=True,
+    pool_use_lifo=True,
+    query_cache_size=1200
+)
+
+
+@event.listens_for(engine, "connect")
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """Apply WAL mode and performance PRAGMAs to every new SQLite connection"""
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA cache_size=-65536")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.execute("PRAGMA mmap_size=268435456")
+        cursor.execute("PRAGMA foreign_keys=ON")
+    finally:
+        cursor.close()
+
+
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
 
 def get_db_session():
-    """Create and return a new database session"""
+    """Create and return a new database session (caller is responsible for closing it)"""
+    return SessionLocal()
+
+
+def to_cents(value):
+    """Convert a dollar amount (float/Decimal/str) to integer cents"""
+    if value is None:
+        return None
+    return int((Decimal(str(value)) * 100).quantize(Decimal('1'), rounding=ROUND_HALF_UP))
+
+
+def from_cents(value):
+    """Convert integer cents read from the database back to a float dollar amount"""
+    if value is None:
+        return None
+    return value / 100
+
+
+class Cents(TypeDecorator):
+    """Monetary column stored as INTEGER cents, exposed to Python as float dollars"""
+    impl = Integer
+    cache_ok = True
+    
+    def process_bind_param(self, value, dialect):
+        return to_cents(value)
+    
+    def process_result_value(self, value, dialect):
+        return from_cents(value)
+
+
+def hash_to_blob(value):
+    """Convert a hex digest string to its raw bytes for storage"""
+    if not value or isinstance(value, bytes):
+        # Already-converted digests pass through unchanged
+        return value
+    try:
+        return bytes.fromhex(value)
+    except ValueError:
+        # Legacy non-hex values are stored unchanged
+        return value
+
+
+def blob_to_hash(value):
+    """Convert a stored raw digest back to the hex string used by the application"""
+    if isinstance(value, bytes):
+        return value.hex()
+    return value
+
+
+class HexDigest(TypeDecorator):
+    """Hash column stored as a raw BLOB digest, exposed to Python as a hex string"""
+    impl = LargeBinary
+    cache_ok = True
+    
+    def process_bind_param(self, value, dialect):
+        return hash_to_blob(value)
+    
+    def process_result_value(self, value, dialect):
+        return blob_to_hash(value)
+
+
+@contextmanager
+def session_scope():
+    """Provide a transactional session that commits on success, rolls back on error and always closes"""
     session = SessionLocal()
     try:
-        return session
+        yield session
+        session.commit()
     except:
-        session.close()
+        session.rollback()
         raise
+    finally:
+        session.close()
+
+
+def ensure_columns(session, table, desired):
+    """
+    Add any missing columns to a table in one savepoint.
+    
+    Args:
+        session: Active database session
+        table: Table name
+        desired: List of (column_name, column_type_sql) tuples
+        
+    Returns:
+        List of column names that were added
+    """
+    existing = {col[1] for col in session.execute(text(f"PRAGMA table_info({table})")).fetchall()}
+    missing = [(name, type_sql) for name, type_sql in desired if name not in existing]
+    
+    if missing:
+        with session.begin_nested():
+            for name, type_sql in missing:
+                session.execute(text(f'ALTER TABLE {table} ADD COLUMN "{name}" {type_sql}'))
+    
+    return [name for name, _ in missing]
 
 
 class TransactionModel(Base):
@@ -33,16 +164,16 @@ class TransactionModel(Base):
     id = Column(Integer, primary_key=True)
     date = Column(Date, nullable=False)  # Transaction date
     description = Column(String, nullable=False)
-    amount = Column(Float, nullable=False)
+    amount = Column(Cents, nullable=False)
     category = Column(String, nullable=False)
     source = Column(String, nullable=False)
     month = Column(String, nullable=False)  # Month in YYYY-MM format
-    transaction_hash = Column(String, unique=True, nullable=False)
+    transaction_hash = Column(HexDigest(16), unique=True, nullable=False)
     
     import_timestamp = Column(DateTime, nullable=True)  # CHANGED: When this batch was imported (exact time)
     rank_within_batch = Column(Integer, nullable=True)  # 1,2,3 for same base_hash
     import_batch_id = Column(String, nullable=True)  # UUID per upload session
-    base_hash = Column(String, nullable=True)  # Core transaction signature
+    base_hash = Column(HexDigest(16), nullable=True)  # Core transaction signature
 
 class InvestmentAccountModel(Base):
     """SQLAlchemy model for Investment Accounts"""
@@ -66,7 +197,8 @@ class PortfolioBalanceModel(Base):
     id = Column(Integer, primary_key=True)
     account_id = Column(Integer, nullable=False)  # References investment_accounts.id
     balance_date = Column(Date, nullable=False)
-    balance_amount = Column(Float, nullable=False)
+    balance_month = Column(String, nullable=False)  # YYYY-MM, derived from balance_date
+    balance_amount = Column(Cents, nullable=False)
     data_source = Column(String, nullable=False)  # 'csv_import', 'manual', 'pdf_statement'
     confidence_score = Column(Float, default=1.0)  # For OCR results (0.0-1.0)
     notes = Column(String)
@@ -83,6 +215,7 @@ class StatementUploadModel(Base):
     id = Column(Integer, primary_key=True)
     account_id = Column(Integer, nullable=True)  # Made nullable for unmatched statements
     statement_date = Column(Date, nullable=True)  # Made nullable for failed extractions
+    statement_month = Column(String, nullable=True)  # YYYY-MM, derived from statement_date
     original_filename = Column(String, nullable=False)
     file_path = Column(String, nullable=False)  # Full PDF path
     
@@ -110,44 +243,29 @@ class StatementUploadModel(Base):
         return f"<StatementUpload(id={self.id}, filename='{self.original_filename}', status='{self.processing_status}')>"
 
 
-def add_statement_uploads_enhancements():
+def add_statement_uploads_enhancements(session):
     """Add new columns to existing statement_uploads table"""
-    session = get_db_session()
     try:
         # Add new columns if they don't exist
-        new_columns = [
-            "ALTER TABLE statement_uploads ADD COLUMN relevant_page_number INTEGER DEFAULT 1",
-            "ALTER TABLE statement_uploads ADD COLUMN page_pdf_path TEXT",
-            "ALTER TABLE statement_uploads ADD COLUMN total_pages INTEGER DEFAULT 1", 
-            "ALTER TABLE statement_uploads ADD COLUMN processing_status TEXT DEFAULT 'pending'",
-            "ALTER TABLE statement_uploads ADD COLUMN processing_error TEXT",
-            "ALTER TABLE statement_uploads ADD COLUMN processed_timestamp DATETIME"
-        ]
-        
-        for sql in new_columns:
-            try:
-                session.execute(text(sql))
-                session.commit()
-                print(f"Added column: {sql.split('ADD COLUMN')[1].split()[0]}")
-            except Exception as e:
-                if "duplicate column name" not in str(e).lower():
-                    print(f"Warning adding column: {str(e)}")
-                session.rollback()
+        added = ensure_columns(session, 'statement_uploads', [
+            ('relevant_page_number', 'INTEGER DEFAULT 1'),
+            ('page_pdf_path', 'TEXT'),
+            ('total_pages', 'INTEGER DEFAULT 1'),
+            ('processing_status', "TEXT DEFAULT 'pending'"),
+            ('processing_error', 'TEXT'),
+            ('processed_timestamp', 'DATETIME')
+        ])
         
-        print("Enhanced statement_uploads table with page detection support")
+        if added:
+            logger.debug(f"Enhanced statement_uploads table with page detection support: {', '.join(added)}")
         
     except Exception as e:
-        session.rollback()
-        print(f"Error enhancing statement_uploads table: {str(e)}")
+        logger.error(f"Error enhancing statement_uploads table: {str(e)}")
         raise
-    finally:
-        session.close()
 
 
 def create_monthly_summary_table(categories):
-    """Create the monthly_summary table with dynamic columns based on categories"""
-    metadata = MetaData()
-    
+    """Define the monthly_summary table with dynamic columns on the shared Base metadata"""
     # Prepare columns list
     columns = [
         Column('id', Integer, primary_key=True),
@@ -158,23 +276,82 @@ def create_monthly_summary_table(categories):
     
     # Add category columns
     for category in categories:
-        columns.append(Column(category, Float, default=0))
+        columns.append(Column(category, Cents, default=0))
     
     # Add calculated columns
-    columns.append(Column('investment_total', Float, default=0))
-    columns.append(Column('total', Float, default=0))
-    columns.append(Column('total_minus_invest', Float, default=0))
-    
-    # Create table definition
-    monthly_summary = Table('monthly_summary', metadata, *columns)
+    columns.append(Column('investment_total', Cents, default=0))
+    columns.append(Column('total', Cents, default=0))
+    columns.append(Column('total_minus_invest', Cents, default=0))
     
-    # Create the table if it doesn't exist
-    metadata.create_all(bind=engine)
+    # Register the table definition; created by the single create_all in init_database
+    monthly_summary = Table('monthly_summary', Base.metadata, *columns, extend_existing=True)
     
     return monthly_summary
 
 
-def seed_investment_accounts():
+def categories_fingerprint(categories):
+    """Signed 32-bit hash of the category set, stored in PRAGMA application_id"""
+    digest = hashlib.sha1(",".join(sorted(categories)).encode()).digest()
+    return int.from_bytes(digest[:4], 'big', signed=True)
+
+
+def sync_monthly_summary_table(session, categories):
+    """Create monthly_summary from precompiled DDL if missing and add columns for new categories"""
+    monthly_summary = create_monthly_summary_table(categories)
+    ddl = str(CreateTable(monthly_summary).compile(engine))
+    session.execute(text(ddl.replace("CREATE TABLE", "CREATE TABLE IF NOT EXISTS", 1)))
+    
+    added = ensure_columns(session, 'monthly_summary', [(category, 'INTEGER DEFAULT 0') for category in categories])
+    if added:
+        logger.debug(f"Added monthly_summary columns for new categories: {', '.join(added)}")
+
+
+def convert_money_columns_to_cents(session):
+    """One-time conversion of stored dollar amounts to integer cents"""
+    money_columns = {
+        'transactions': ['amount'],
+        'portfolio_balances': ['balance_amount'],
+        'bank_balances': ['beginning_balance', 'ending_balance', 'deposits_additions', 'withdrawals_subtractions'],
+        # Every monthly_summary column except the identifiers holds a dollar total
+        'monthly_summary': [
+            col[1] for col in session.execute(text("PRAGMA table_info(monthly_summary)")).fetchall()
+            if col[1] not in ('id', 'month', 'year', 'month_year')
+        ]
+    }
+    
+    try:
+        for table, columns in money_columns.items():
+            assignments = ', '.join(f'"{col}" = CAST(ROUND("{col}" * 100) AS INTEGER)' for col in columns)
+            session.execute(text(f"UPDATE {table} SET {assignments}"))
+        logger.debug("Converted monetary columns to integer cents")
+        
+    except Exception as e:
+        logger.error(f"Error converting monetary columns to cents: {str(e)}")
+        raise
+
+
+def convert_hashes_to_blobs(session):
+    """One-time conversion of hex transaction hashes to raw BLOB digests"""
+    try:
+        rows = session.execute(text("SELECT id, transaction_hash, base_hash FROM transactions")).fetchall()
+        updates = [
+            {"id": row.id, "transaction_hash": hash_to_blob(row.transaction_hash), "base_hash": hash_to_blob(row.base_hash)}
+            for row in rows
+        ]
+        if updates:
+            session.execute(text("""
+            UPDATE transactions 
+            SET transaction_hash = :transaction_hash, base_hash = :base_hash 
+            WHERE id = :id
+            """), updates)
+        logger.debug(f"Converted {len(updates)} transaction hashes to binary digests")
+        
+    except Exception as e:
+        logger.error(f"Error converting transaction hashes: {str(e)}")
+        raise
+
+
+def seed_investment_accounts(session):
     """Seed the investment accounts table with the 7 core accounts"""
     accounts_data = [
         {
@@ -214,33 +391,20 @@ def seed_investment_accounts():
         }
     ]
     
-    session = get_db_session()
     try:
-        # Check if accounts already exist
-        existing_count = session.query(InvestmentAccountModel).count()
-        if existing_count > 0:
-            print(f"Investment accounts already seeded ({existing_count} accounts found)")
+        # Check if accounts already exist (stops at the first row instead of counting)
+        already_seeded = session.execute(text("SELECT 1 FROM investment_accounts LIMIT 1")).scalar()
+        if already_seeded:
+            logger.debug("Investment accounts already seeded")
             return
         
-        # Insert accounts
-        for account_data in accounts_data:
-            account = InvestmentAccountModel(**account_data)
-            session.add(account)
-        
-        session.commit()
-        print(f"Successfully seeded {len(accounts_data)} investment accounts")
-        
-        # Print the seeded accounts for verification
-        accounts = session.query(InvestmentAccountModel).all()
-        for account in accounts:
-            print(f"  - {account.account_name} ({account.institution}, {account.account_type})")
+        # Insert all accounts through Core executemany, skipping ORM object construction
+        session.execute(_INSERT_INVESTMENT_ACCOUNT, accounts_data)
+        logger.debug(f"Successfully seeded {len(accounts_data)} investment accounts")
             
     except Exception as e:
-        session.rollback()
-        print(f"Error seeding investment accounts: {str(e)}")
+        logger.error(f"Error seeding investment accounts: {str(e)}")
         raise
-    finally:
-        session.close()
 
 class BankBalanceModel(Base):
     """SQLAlchemy model for Bank Account Balances"""
@@ -250,10 +414,10 @@ class BankBalanceModel(Base):
     account_name = Column(String, nullable=False)  # 'Wells Fargo Checking', 'Wells Fargo Savings'
     account_number = Column(String)  # '3207122866', '3218415499'
     statement_month = Column(String, nullable=False)  # '2025-05' (YYYY-MM format)
-    beginning_balance = Column(Float, nullable=False)  # 22782.90
-    ending_balance = Column(Float, nullable=False)     # 25736.30
-    deposits_additions = Column(Float)                  # 8747.54
-    withdrawals_subtractions = Column(Float)           # 5794.14
+    beginning_balance = Column(Cents, nullable=False)  # 22782.90
+    ending_balance = Column(Cents, nullable=False)     # 25736.30
+    deposits_additions = Column(Cents)                  # 8747.54
+    withdrawals_subtractions = Column(Cents)           # 5794.14
     statement_date = Column(Date, nullable=False)      # 2025-05-31
     data_source = Column(String, default='pdf_statement')  # 'pdf_statement', 'excel_import'
     confidence_score = Column(Float, default=1.0)
@@ -262,42 +426,75 @@ class BankBalanceModel(Base):
     
     def __repr__(self):
         return f"<BankBalance(account='{self.account_name}', date='{self.statement_date}', balance={self.ending_balance})>"
+
+
+# Insert statements built once at import so hot insert paths reuse the compiled SQL
+_INSERT_TRANSACTION = insert(TransactionModel.__table__)
+_INSERT_INVESTMENT_ACCOUNT = insert(InvestmentAccountModel.__table__)
+# INSERT ... ON CONFLICT(account_id, balance_date) DO UPDATE, backed by idx_portfolio_balances_unique
+_UPSERT_PORTFOLIO_BALANCE = sqlite_insert(PortfolioBalanceModel.__table__)
+_UPSERT_PORTFOLIO_BALANCE = _UPSERT_PORTFOLIO_BALANCE.on_conflict_do_update(
+    index_elements=['account_id', 'balance_date'],
+    set_={
+        column: _UPSERT_PORTFOLIO_BALANCE.excluded[column]
+        for column in ('balance_month', 'balance_amount', 'data_source', 'confidence_score', 'notes')
+    }
+)
+_UPSERT_PORTFOLIO_BALANCE_RETURNING = _UPSERT_PORTFOLIO_BALANCE.returning(
+    PortfolioBalanceModel.__table__.c.id,
+    PortfolioBalanceModel.__table__.c.created_at
+)
+
+
+def insert_transaction(session, row):
+    """Insert one transaction row (dict of column values) and return its new id"""
+    result = session.execute(_INSERT_TRANSACTION, row)
+    return result.inserted_primary_key[0]
+
+
+def upsert_portfolio_balances(session, rows):
+    """Insert or overwrite (per account and date) many portfolio balance rows with a single executemany"""
+    if rows:
+        session.execute(_UPSERT_PORTFOLIO_BALANCE, rows)
+
+
+def upsert_portfolio_balance(session, row):
+    """
+    Insert or overwrite one portfolio balance row and return its stored (id, created_at)
+    in the same statement. created_at is left untouched on conflict, so a returned value
+    that differs from the one bound in row means an existing balance was updated.
+    """
+    return session.execute(_UPSERT_PORTFOLIO_BALANCE_RETURNING, row).one()
+
     
-def add_bank_balance_constraints():
+def add_bank_balance_constraints(session):
     """Add database constraints for bank_balances table"""
-    session = get_db_session()
     try:
-        # Add unique constraint for bank_balances (account_name, statement_month)
-        session.execute(text("""
-        CREATE UNIQUE INDEX IF NOT EXISTS idx_bank_balances_unique 
-        ON bank_balances(account_name, statement_month)
-        """))
-        
-        # Add index for faster queries
-        session.execute(text("""
-        CREATE INDEX IF NOT EXISTS idx_bank_balances_date 
-        ON bank_balances(statement_date)
-        """))
-        
-        session.execute(text("""
-        CREATE INDEX IF NOT EXISTS idx_bank_balances_account 
-        ON bank_balances(account_name)
-        """))
+        with session.begin_nested():
+            # Add unique constraint for bank_balances (account_name, statement_month)
+            session.execute(text("""
+            CREATE UNIQUE INDEX IF NOT EXISTS idx_bank_balances_unique 
+            ON bank_balances(account_name, statement_month)
+            """))
+            
+            # Add index for faster queries
+            session.execute(text("""
+            CREATE INDEX IF NOT EXISTS idx_bank_balances_date 
+            ON bank_balances(statement_date)
+            """))
+            
+            # account_name lookups are served by the unique index's leading column
+            session.execute(text("DROP INDEX IF EXISTS idx_bank_balances_account"))
         
-        session.commit()
-        print("Added bank balance database constraints and indexes")
+        logger.debug("Added bank balance database constraints and indexes")
         
     except Exception as e:
-        session.rollback()
-        print(f"Warning: Could not add bank balance constraints: {str(e)}")
-    finally:
-        session.close()
+        logger.warning(f"Could not add bank balance constraints: {str(e)}")
 
-def add_timestamp_based_duplicate_detection():
+def add_timestamp_based_duplicate_detection(session):
     """Update database schema from date-based to timestamp-based duplicate detection"""
-    session = get_db_session()
     try:
-        print("🔄 Migrating from import_date to import_timestamp...")
+        logger.debug("Migrating from import_date to import_timestamp...")
         
         # Check if import_timestamp already exists
         columns_query = session.execute(text("PRAGMA table_info(transactions)")).fetchall()
@@ -306,7 +503,7 @@ def add_timestamp_based_duplicate_detection():
         if 'import_timestamp' not in column_names:
             # Add new timestamp column
             session.execute(text("ALTER TABLE transactions ADD COLUMN import_timestamp DATETIME"))
-            print("   ✅ Added import_timestamp column")
+            logger.debug("Added import_timestamp column")
             
             # Migrate existing import_date data to import_timestamp (if any exists)
             if 'import_date' in column_names:
@@ -315,181 +512,233 @@ def add_timestamp_based_duplicate_detection():
                 SET import_timestamp = datetime(import_date || ' 12:00:00') 
                 WHERE import_date IS NOT NULL
                 """))
-                print("   ✅ Migrated existing import_date data to import_timestamp")
-            
-            session.commit()
-        else:
-            print("   ℹ️  import_timestamp column already exists")
+                logger.debug("Migrated existing import_date data to import_timestamp")
         
         # Add other columns if they don't exist
-        new_columns = [
-            ("rank_within_batch", "ALTER TABLE transactions ADD COLUMN rank_within_batch INTEGER"),
-            ("import_batch_id", "ALTER TABLE transactions ADD COLUMN import_batch_id TEXT"), 
-            ("base_hash", "ALTER TABLE transactions ADD COLUMN base_hash TEXT")
-        ]
+        added = ensure_columns(session, 'transactions', [
+            ('rank_within_batch', 'INTEGER'),
+            ('import_batch_id', 'TEXT'),
+            ('base_hash', 'TEXT')
+        ])
+        for col_name in added:
+            logger.debug(f"Added {col_name} column")
         
-        for col_name, sql in new_columns:
-            if col_name not in column_names:
-                try:
-                    session.execute(text(sql))
-                    session.commit()
-                    print(f"   ✅ Added {col_name} column")
-                except Exception as e:
-                    if "duplicate column name" not in str(e).lower():
-                        print(f"   ⚠️  Warning adding {col_name}: {str(e)}")
-                    session.rollback()
-            else:
-                print(f"   ℹ️  {col_name} column already exists")
+        # Covering index for the per-month category totals behind monthly_summary
+        try:
+            with session.begin_nested():
+                session.execute(text("""
+                CREATE INDEX IF NOT EXISTS idx_transactions_month_category 
+                ON transactions(month, category, amount)
+                """))
+        except Exception as e:
+            logger.warning(f"Index creation warning: {str(e)}")
         
         # Add/update indexes for duplicate detection queries
         try:
-            session.execute(text("""
-            CREATE INDEX IF NOT EXISTS idx_transactions_base_hash_rank_timestamp 
-            ON transactions(base_hash, rank_within_batch, import_timestamp)
-            """))
-            session.commit()
-            print("   ✅ Added optimized index for duplicate detection")
+            with session.begin_nested():
+                # Recreate with trailing transaction_hash so duplicate probes are index-only
+                session.execute(text("DROP INDEX IF EXISTS idx_transactions_base_hash_rank_timestamp"))
+                session.execute(text("""
+                CREATE INDEX IF NOT EXISTS idx_transactions_base_hash_rank_timestamp 
+                ON transactions(base_hash, rank_within_batch, import_timestamp, transaction_hash)
+                """))
+            logger.debug("Added optimized index for duplicate detection")
         except Exception as e:
-            print(f"   ⚠️  Index creation warning: {str(e)}")
-            session.rollback()
+            logger.warning(f"Index creation warning: {str(e)}")
         
-        print("✅ Timestamp-based duplicate detection migration complete!")
+        logger.debug("Timestamp-based duplicate detection migration complete!")
         
     except Exception as e:
-        session.rollback()
-        print(f"❌ Error in timestamp migration: {str(e)}")
+        logger.error(f"Error in timestamp migration: {str(e)}")
         raise
-    finally:
-        session.close()
 
 def init_database(categories):
     """Initialize the SQLite database with required tables"""
-    print("Initializing database...")
-    
-    # Create all SQLAlchemy tables
-    Base.metadata.create_all(bind=engine)
-    
-    # Create monthly_summary table with dynamic columns
-    create_monthly_summary_table(categories)
-    
-    # Seed investment accounts
-    seed_investment_accounts()
-    
-    # Add portfolio constraints
-    add_portfolio_constraints()
-    
-    add_bank_balance_constraints()
-    
-    # Add statement uploads enhancements
-    add_statement_uploads_enhancements()
-    
-    add_enhanced_duplicate_constraints()
-    
-    # UPDATED: Add timestamp-based duplicate detection
-    add_timestamp_based_duplicate_detection()
-    
-    print("Database initialized successfully with timestamp-based duplicate detection.")
+    categories = list(categories)
+    fingerprint = categories_fingerprint(categories)
+    
+    # Fast path: schema already at the current version with the same categories
+    with engine.connect() as connection:
+        current_version = connection.execute(text("PRAGMA user_version")).scalar()
+        current_fingerprint = connection.execute(text("PRAGMA application_id")).scalar()
+    if current_version == SCHEMA_VERSION:
+        if current_fingerprint != fingerprint:
+            # Only the category set changed, so just update monthly_summary
+            with session_scope() as session:
+                session.execute(text("BEGIN IMMEDIATE"))
+                sync_monthly_summary_table(session, categories)
+                session.execute(text(f"PRAGMA application_id = {fingerprint}"))
+        return
+    
+    logger.debug("Initializing database...")
+    
+    # All migration steps share one session so the whole schema setup
+    # is a single transaction (and a single fsync) on SQLite
+    try:
+        with session_scope() as session:
+            # pysqlite does not open a transaction for DDL on its own; take the
+            # write lock up front so concurrent workers don't race on upgrade
+            session.execute(text("BEGIN IMMEDIATE"))
+            
+            # Re-read the version under the lock: a worker that waited on it may find
+            # another one already migrated, and must not convert the data a second time
+            current_version = session.execute(text("PRAGMA user_version")).scalar()
+            if current_version == SCHEMA_VERSION:
+                if session.execute(text("PRAGMA application_id")).scalar() != fingerprint:
+                    sync_monthly_summary_table(session, categories)
+                    session.execute(text(f"PRAGMA application_id = {fingerprint}"))
+                return
+            
+            # Define monthly_summary table with dynamic columns
+            create_monthly_summary_table(categories)
+            
+            # Create all tables, including monthly_summary, in one pass
+            Base.metadata.create_all(bind=session.connection())
+            
+            # Add columns for categories added since the table was created
+            sync_monthly_summary_table(session, categories)
+            
+            # Seed investment accounts
+            seed_investment_accounts(session)
+            
+            # Add portfolio constraints
+            add_portfolio_constraints(session)
+            
+            add_bank_balance_constraints(session)
+            
+            # Add statement uploads enhancements
+            add_statement_uploads_enhancements(session)
+            
+            add_month_columns(session)
+            
+            add_enhanced_duplicate_constraints(session)
+            
+            # UPDATED: Add timestamp-based duplicate detection
+            add_timestamp_based_duplicate_detection(session)
+            
+            # Existing databases still hold dollar amounts; convert them exactly once
+            if current_version < CENTS_SCHEMA_VERSION:
+                convert_money_columns_to_cents(session)
+            
+            # SQLite 3.40 has no unhex(), so hashes are converted from Python
+            if current_version < HASH_BLOB_SCHEMA_VERSION:
+                convert_hashes_to_blobs(session)
+            
+            # Refresh planner statistics so composite indexes serve prefix lookups
+            session.execute(text("ANALYZE"))
+            
+            # Record the schema version as part of the same transaction
+            session.execute(text(f"PRAGMA user_version = {SCHEMA_VERSION}"))
+            session.execute(text(f"PRAGMA application_id = {fingerprint}"))
+            
+        logger.debug("Database initialized successfully with timestamp-based duplicate detection.")
+        
+    except Exception as e:
+        logger.error(f"Error initializing database: {str(e)}")
+        raise
 
-def add_portfolio_constraints():
+def add_portfolio_constraints(session):
     """Add database constraints for portfolio tables"""
-    session = get_db_session()
     try:
-        # Add unique constraint for portfolio_balances (account_id, balance_date)
-        session.execute(text("""
-        CREATE UNIQUE INDEX IF NOT EXISTS idx_portfolio_balances_unique 
-        ON portfolio_balances(account_id, balance_date)
-        """))
-        
-        # Add index for faster queries
-        session.execute(text("""
-        CREATE INDEX IF NOT EXISTS idx_portfolio_balances_date 
-        ON portfolio_balances(balance_date)
-        """))
-        
-        session.execute(text("""
-        CREATE INDEX IF NOT EXISTS idx_portfolio_balances_account 
-        ON portfolio_balances(account_id)
-        """))
+        with session.begin_nested():
+            # Add unique constraint for portfolio_balances (account_id, balance_date)
+            session.execute(text("""
+            CREATE UNIQUE INDEX IF NOT EXISTS idx_portfolio_balances_unique 
+            ON portfolio_balances(account_id, balance_date)
+            """))
+            
+            # Add index for faster queries
+            session.execute(text("""
+            CREATE INDEX IF NOT EXISTS idx_portfolio_balances_date 
+            ON portfolio_balances(balance_date)
+            """))
+            
+            # account_id lookups are served by the unique index's leading column
+            session.execute(text("DROP INDEX IF EXISTS idx_portfolio_balances_account"))
         
-        session.commit()
-        print("Added portfolio database constraints and indexes")
+        logger.debug("Added portfolio database constraints and indexes")
         
     except Exception as e:
-        session.rollback()
-        print(f"Warning: Could not add constraints: {str(e)}")
-    finally:
-        session.close()
+        logger.warning(f"Could not add constraints: {str(e)}")
 
-def add_enhanced_duplicate_constraints():
-    """Add enhanced constraints to prevent statement duplicates"""
-    session = get_db_session()
+def add_month_columns(session):
+    """Add materialized YYYY-MM columns used by the month-level duplicate indexes"""
     try:
-        # Enhanced bank balance constraints - add statement date tracking
-        session.execute(text("""
-        CREATE INDEX IF NOT EXISTS idx_bank_balances_statement_date 
-        ON bank_balances(account_name, statement_date)
-        """))
+        ensure_columns(session, 'portfolio_balances', [('balance_month', 'TEXT')])
+        ensure_columns(session, 'statement_uploads', [('statement_month', 'TEXT')])
         
-        # Enhanced portfolio balance constraints - month-level uniqueness
+        # Backfill rows written before the columns existed
         session.execute(text("""
-        CREATE INDEX IF NOT EXISTS idx_portfolio_balances_month 
-        ON portfolio_balances(account_id, strftime('%Y-%m', balance_date))
+        UPDATE portfolio_balances 
+        SET balance_month = strftime('%Y-%m', balance_date) 
+        WHERE balance_month IS NULL
         """))
-        
-        # Statement upload filename protection
         session.execute(text("""
-        CREATE UNIQUE INDEX IF NOT EXISTS idx_statement_uploads_filename 
-        ON statement_uploads(original_filename)
+        UPDATE statement_uploads 
+        SET statement_month = strftime('%Y-%m', statement_date) 
+        WHERE statement_month IS NULL AND statement_date IS NOT NULL
         """))
         
-        # Statement upload account+month protection for processed statements
-        session.execute(text("""
-        CREATE INDEX IF NOT EXISTS idx_statement_uploads_account_month 
-        ON statement_uploads(account_id, strftime('%Y-%m', statement_date))
-        WHERE processing_status IN ('processed', 'saved')
-        """))
+        # Replace the old strftime() expression indexes
+        session.execute(text("DROP INDEX IF EXISTS idx_portfolio_balances_month"))
+        session.execute(text("DROP INDEX IF EXISTS idx_statement_uploads_account_month"))
         
-        session.commit()
-        print("Added enhanced duplicate detection constraints and indexes")
+    except Exception as e:
+        logger.error(f"Error adding month columns: {str(e)}")
+        raise
+
+def add_enhanced_duplicate_constraints(session):
+    """Add enhanced constraints to prevent statement duplicates"""
+    try:
+        with session.begin_nested():
+            # Enhanced bank balance constraints - add statement date tracking
+            session.execute(text("""
+            CREATE INDEX IF NOT EXISTS idx_bank_balances_statement_date 
+            ON bank_balances(account_name, statement_date)
+            """))
+            
+            # Enhanced portfolio balance constraints - month-level uniqueness
+            session.execute(text("""
+            CREATE INDEX IF NOT EXISTS idx_portfolio_balances_month 
+            ON portfolio_balances(account_id, balance_month)
+            """))
+            
+            # Statement upload filename protection
+            session.execute(text("""
+            CREATE UNIQUE INDEX IF NOT EXISTS idx_statement_uploads_filename 
+            ON statement_uploads(original_filename)
+            """))
+            
+            # Statement upload account+month protection for processed statements
+            session.execute(text("""
+            CREATE INDEX IF NOT EXISTS idx_statement_uploads_account_month 
+            ON statement_uploads(account_id, statement_month)
+            WHERE processing_status IN ('processed', 'saved')
+            """))
+        
+        logger.debug("Added enhanced duplicate detection constraints and indexes")
         
     except Exception as e:
-        session.rollback()
-        print(f"Warning: Could not add enhanced constraints: {str(e)}")
-    finally:
-        session.close()
+        logger.warning(f"Could not add enhanced constraints: {str(e)}")
 
-def add_rank_based_duplicate_detection():
+def add_rank_based_duplicate_detection(session):
     """Add new columns for rank-based duplicate detection"""
-    session = get_db_session()
     try:
-        new_columns = [
-            "ALTER TABLE transactions ADD COLUMN import_date DATE",
-            "ALTER TABLE transactions ADD COLUMN rank_within_batch INTEGER",
-            "ALTER TABLE transactions ADD COLUMN import_batch_id TEXT", 
-            "ALTER TABLE transactions ADD COLUMN base_hash TEXT"
-        ]
-        
-        for sql in new_columns:
-            try:
-                session.execute(text(sql))
-                session.commit()
-            except Exception as e:
-                if "duplicate column name" not in str(e).lower():
-                    print(f"Warning adding column: {str(e)}")
-                session.rollback()
+        ensure_columns(session, 'transactions', [
+            ('import_date', 'DATE'),
+            ('rank_within_batch', 'INTEGER'),
+            ('import_batch_id', 'TEXT'),
+            ('base_hash', 'TEXT')
+        ])
         
         # Add index for duplicate detection queries
         session.execute(text("""
         CREATE INDEX IF NOT EXISTS idx_transactions_base_hash_rank 
         ON transactions(base_hash, rank_within_batch)
         """))
-        session.commit()
         
-        print("Added rank-based duplicate detection columns and indexes")
+        logger.debug("Added rank-based duplicate detection columns and indexes")
         
     except Exception as e:
-        session.rollback()
-        print(f"Error adding rank-based columns: {str(e)}")
-        raise
-    finally:
-        session.close()
\ No newline at end of file
+        logger.error(f"Error adding rank-based columns: {str(e)}")
+        raise
\ No newline at end of file
@@ -4,64 +4,122 @@ Script to truncate transactions and monthly_summary tables for fresh start.
 Run this before testing the new rank-based duplicate detection system.
 """
 
-from database import get_db_session
-from sqlalchemy import text
+import sqlite3
+from datetime import datetime
+import os
+
+# Same file as database.DB_NAME; importing database would pull in SQLAlchemy
+DB_NAME = 'finances.db'
+
+def connect():
+    """Open a plain sqlite3 connection in autocommit mode (transactions are explicit)"""
+    connection = sqlite3.connect(DB_NAME, isolation_level=None)
+    connection.execute("PRAGMA journal_mode=WAL")
+    return connection
+
+def backup_database(backup_path=None):
+    """
+    Write a compacted copy of the database before resetting it.
+    Uses VACUUM INTO, which skips free pages and writes the copy sequentially.
+    """
+    if backup_path is None:
+        name, ext = os.path.splitext(DB_NAME)
+        backup_path = f"{name}_backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}{ext}"
+    
+    print(f"💾 Backing up database to {backup_path}...")
+    
+    # VACUUM INTO cannot run inside a transaction; the connection is in autocommit mode
+    connection = connect()
+    try:
+        connection.execute("VACUUM INTO ?", (backup_path,))
+    finally:
+        connection.close()
+    
+    print(f"   Backup written ({os.path.getsize(backup_path) / 1024:.0f} KB)")
+    return backup_path
+
+# Whole reset as one script: a single write transaction, truncate-eligible
+# unqualified DELETEs, one batched sqlite_sequence reset, and fresh planner
+# statistics so sqlite_stat1 no longer describes the pre-reset row counts
+RESET_SCRIPT = """
+BEGIN IMMEDIATE;
+DELETE FROM transactions;
+DELETE FROM monthly_summary;
+DELETE FROM sqlite_sequence WHERE name IN ('transactions', 'monthly_summary');
+ANALYZE transactions;
+ANALYZE monthly_summary;
+COMMIT;
+"""
 
 def reset_transactions_and_summaries():
     """
     Truncate transactions and monthly_summary tables to start fresh.
     This preserves the table structure but removes all data.
     """
-    session = get_db_session()
+    connection = connect()
     
     try:
         print("🗑️  Resetting database tables...")
-        
-        # Disable foreign key checks (SQLite specific)
-        session.execute(text("PRAGMA foreign_keys = OFF"))
-        
-        # Truncate transactions table
-        print("   Clearing transactions table...")
-        session.execute(text("DELETE FROM transactions"))
-        session.execute(text("DELETE FROM sqlite_sequence WHERE name='transactions'"))  # Reset auto-increment
-        
-        # Truncate monthly_summary table  
-        print("   Clearing monthly_summary table...")
-        session.execute(text("DELETE FROM monthly_summary"))
-        session.execute(text("DELETE FROM sqlite_sequence WHERE name='monthly_summary'"))  # Reset auto-increment
-        
-        # Re-enable foreign key checks
-        session.execute(text("PRAGMA foreign_keys = ON"))
-        
-        # Commit all changes
-        session.commit()
+        print("   Clearing transactions and monthly_summary tables...")
+        connection.executescript(RESET_SCRIPT)
         
         print("✅ Database reset complete!")
         print("   - All transactions deleted")
         print("   - All monthly summaries deleted") 
         print("   - Auto-increment counters reset")
+        print("   - Query planner statistics refreshed")
         print("   - Table structures preserved")
         print("\n🚀 Ready for fresh data upload!")
         
     except Exception as e:
-        session.rollback()
+        if connection.in_transaction:
+            connection.execute("ROLLBACK")
         print(f"❌ Error resetting database: {str(e)}")
         raise e
     finally:
-        session.close()
+        connection.close()
+
+def compact_database(freelist_threshold=0.1):
+    """
+    VACUUM the database when enough pages were freed by the reset.
+    Only runs when freelist_count / page_count exceeds the threshold.
+    """
+    # VACUUM cannot run inside a transaction; the connection is in autocommit mode
+    connection = connect()
+    try:
+        page_size = connection.execute("PRAGMA page_size").fetchone()[0]
+        page_count = connection.execute("PRAGMA page_count").fetchone()[0]
+        freelist_count = connection.execute("PRAGMA freelist_count").fetchone()[0]
+        
+        # Reclaimable space comes straight from SQLite's page bookkeeping
+        reclaimable_kb = freelist_count * page_size / 1024
+        
+        if not page_count or freelist_count / page_count <= freelist_threshold:
+            print(f"   Skipping VACUUM ({reclaimable_kb:.0f} KB reclaimable, {freelist_count}/{page_count} pages free)")
+        else:
+            print(f"   Compacting database ({page_count * page_size / 1024:.0f} KB, {reclaimable_kb:.0f} KB reclaimable)...")
+            connection.execute("VACUUM")
+            new_page_count = connection.execute("PRAGMA page_count").fetchone()[0]
+            print(f"   Database compacted to {new_page_count * page_size / 1024:.0f} KB "
+                  f"({(page_count - new_page_count) * page_size / 1024:.0f} KB reclaimed)")
+        
+        # Refresh planner statistics for the now-empty tables
+        connection.execute("PRAGMA optimize")
+    finally:
+        connection.close()
 
 def verify_reset():
     """
     Verify that tables are empty after reset.
     """
-    session = get_db_session()
+    connection = connect()
     
     try:
-        # Count transactions
-        transaction_count = session.execute(text("SELECT COUNT(*) FROM transactions")).scalar()
-        
-        # Count monthly summaries
-        summary_count = session.execute(text("SELECT COUNT(*) FROM monthly_summary")).scalar()
+        # Count both tables in a single statement
+        transaction_count, summary_count = connection.execute("""
+            SELECT (SELECT COUNT(*) FROM transactions),
+                   (SELECT COUNT(*) FROM monthly_summary)
+        """).fetchone()
         
         print(f"\n📊 Verification:")
         print(f"   Transactions: {transaction_count} records")
@@ -75,7 +133,7 @@ def verify_reset():
     except Exception as e:
         print(f"❌ Error verifying reset: {str(e)}")
     finally:
-        session.close()
+        connection.close()
 
 if __name__ == "__main__":
     print("🔄 Finance Tracker Database Reset")
@@ -85,7 +143,9 @@ if __name__ == "__main__":
     confirm = input("Are you sure you want to delete ALL transactions and monthly summaries? (yes/no): ")
     
     if confirm.lower() in ['yes', 'y']:
+        backup_database()
         reset_transactions_and_summaries()
+        compact_database()
         verify_reset()
     else:
         print("❌ Reset cancelled")
\ No newline at end of file
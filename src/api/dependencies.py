@@ -2,6 +2,7 @@
 
 from fastapi import Depends
 from typing import Generator
+from functools import lru_cache
 
 from src.repositories.transaction_repository import TransactionRepository
 from src.repositories.monthly_summary_repository import MonthlySummaryRepository
@@ -26,27 +27,36 @@ def get_db():
     finally:
         db.close()
 
+# Repositories hold no per-request state, so one instance per process is shared
+_transaction_repository = TransactionRepository()
+_monthly_summary_repository = MonthlySummaryRepository()
+_portfolio_repository = PortfolioRepository()
+_bank_balance_repository = BankBalanceRepository()
+
 # Repository dependencies
+@lru_cache(maxsize=None)
 def get_config_manager():
-    """Get the configuration manager"""
+    """Get the configuration manager (config.yaml is parsed once per process)"""
     return ConfigManager()
 
 def get_transaction_repository():
     """Get the transaction repository"""
-    return TransactionRepository()
+    return _transaction_repository
 
 def get_monthly_summary_repository():
     """Get the monthly summary repository"""
-    return MonthlySummaryRepository()
+    return _monthly_summary_repository
 
 def get_portfolio_repository():
     """Get the portfolio repository"""
-    return PortfolioRepository()
+    return _portfolio_repository
 
 def get_bank_balance_repository() -> BankBalanceRepository:
     """Get bank balance repository instance"""
-    return BankBalanceRepository()
+    return _bank_balance_repository
 
+# Services are cached per set of (singleton) dependencies, i.e. built once per process
+@lru_cache(maxsize=None)
 def get_financial_metrics_service(
     bank_repo: BankBalanceRepository = Depends(get_bank_balance_repository),
     portfolio_repo: PortfolioRepository = Depends(get_portfolio_repository),
@@ -56,6 +66,7 @@ def get_financial_metrics_service(
     return FinancialMetricsService(bank_repo, portfolio_repo, monthly_summary_repo)
 
 # Service dependencies
+@lru_cache(maxsize=None)
 def get_import_service(
     transaction_repo: TransactionRepository = Depends(get_transaction_repository),
     monthly_summary_repo: MonthlySummaryRepository = Depends(get_monthly_summary_repository),
@@ -64,6 +75,7 @@ def get_import_service(
     """Get the import service with its dependencies"""
     return ImportService(transaction_repo, monthly_summary_repo, config)
 
+@lru_cache(maxsize=None)
 def get_reporting_service(
     transaction_repo: TransactionRepository = Depends(get_transaction_repository),
     monthly_summary_repo: MonthlySummaryRepository = Depends(get_monthly_summary_repository)
@@ -71,6 +83,7 @@ def get_reporting_service(
     """Get the reporting service with its dependencies"""
     return ReportingService(transaction_repo, monthly_summary_repo)
 
+@lru_cache(maxsize=None)
 def get_portfolio_service(
     portfolio_repo: PortfolioRepository = Depends(get_portfolio_repository),
     transaction_repo: TransactionRepository = Depends(get_transaction_repository)
@@ -5,12 +5,22 @@ SECURITY UPDATE STEP 4: Removed hardcoded IP addresses for secure deployment
 """
 
 import os
+import orjson
 from dotenv import load_dotenv
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.openapi.docs import get_swagger_ui_html
+from fastapi.responses import HTMLResponse, ORJSONResponse, Response
+from fastapi.staticfiles import StaticFiles
 
-from src.api.utils.error_handling import APIError, api_error_handler
+from sqlalchemy import text
+
+from database import SCHEMA_VERSION, get_db_session, init_database
+from src.api.utils.error_handling import APIError, UnhandledErrorMiddleware, api_error_handler
+from src.api.dependencies import (
+    get_config_manager, get_transaction_repository, get_monthly_summary_repository,
+    get_import_service, get_reporting_service
+)
 from src.api.routers import exports
 
 # Load environment variables
@@ -42,52 +52,86 @@ app = FastAPI(
     This API is designed to be consumed by a React frontend. CORS is configured for secure development and production deployment.
     """,
     version="1.0.0",
-    docs_url=None  # We'll customize the docs URL
+    docs_url=None,  # We'll customize the docs URL
+    default_response_class=ORJSONResponse
 )
 
+# Unexpected route errors become a generic 500 here; added before CORSMiddleware so it
+# sits inside it and the error response still carries the CORS headers. It is a plain
+# ASGI middleware, so requests don't pay for a BaseHTTPMiddleware hop
+app.add_middleware(UnhandledErrorMiddleware)
+
+# CORS origins are matched with one compiled regex rather than a list scan per request
 if env == "production":
     # Production CORS settings - use relative URLs
-    origins = [
-        "https://your-production-domain.com",  # Update with your actual domain
-        "https://www.your-production-domain.com"
-    ]
+    # Update with your actual domain (matches the apex and www. host)
+    origin_regex = r"^https://(www\.)?your-production-domain\.com$"
 else:
     # Development CORS settings - localhost-based for security
-    origins = [
-        "http://localhost:3000",          # React dev server
-        "http://127.0.0.1:3000",         # Alternative localhost
-        "http://localhost:3001",         # Alternative port
-        "http://127.0.0.1:3001",         # Alternative port
-        # For mobile development, use ngrok instead
-    ]
+    # React dev server and alternative port on localhost / 127.0.0.1
+    # For mobile development, use ngrok instead
+    origin_regex = r"^http://(localhost|127\.0\.0\.1):300[01]$"
 
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=origins,
+    allow_origin_regex=origin_regex,
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
+    allow_headers=["Content-Type", "Authorization"],
+    max_age=86400,  # Let browsers cache preflight responses for a day
 )
 
 # Exception handlers
 app.add_exception_handler(APIError, api_error_handler)
 
-# Custom Swagger UI with additional info
+class CachedStaticFiles(StaticFiles):
+    """Static files served with long-lived, immutable cache headers"""
+    
+    def file_response(self, *args, **kwargs):
+        response = super().file_response(*args, **kwargs)
+        response.headers["Cache-Control"] = "public, max-age=31536000, immutable"
+        return response
+
+# Swagger UI assets are served locally when vendored into
+# src/api/static/swagger-ui/<SWAGGER_UI_VERSION>/ (swagger-ui-bundle.js / swagger-ui.css
+# from swagger-ui-dist), otherwise from the CDN. The version is part of the URL, so the
+# immutable cache headers never pin stale assets after an upgrade.
+STATIC_DIR = os.path.join(os.path.dirname(__file__), "static")
+SWAGGER_UI_VERSION = "5.17.14"
+SWAGGER_UI_PATH = f"swagger-ui/{SWAGGER_UI_VERSION}"
+
+if os.path.isdir(STATIC_DIR):
+    app.mount("/static", CachedStaticFiles(directory=STATIC_DIR), name="static")
+
+if os.path.exists(os.path.join(STATIC_DIR, SWAGGER_UI_PATH, "swagger-ui-bundle.js")):
+    SWAGGER_JS_URL = f"/static/{SWAGGER_UI_PATH}/swagger-ui-bundle.js"
+    SWAGGER_CSS_URL = f"/static/{SWAGGER_UI_PATH}/swagger-ui.css"
+else:
+    SWAGGER_JS_URL = "https://cdn.jsdelivr.net/npm/swagger-ui-dist@5/swagger-ui-bundle.js"
+    SWAGGER_CSS_URL = "https://cdn.jsdelivr.net/npm/swagger-ui-dist@5/swagger-ui.css"
+
+# Custom Swagger UI with additional info - the page only depends on fixed app
+# metadata, so it is rendered once at import and the bytes are reused
+_SWAGGER_HTML = get_swagger_ui_html(
+    openapi_url=app.openapi_url,
+    title=app.title + " - API Documentation",
+    swagger_js_url=SWAGGER_JS_URL,
+    swagger_css_url=SWAGGER_CSS_URL,
+    swagger_favicon_url="/favicon.ico",
+).body
+
 @app.get("/docs", include_in_schema=False)
 async def custom_swagger_ui_html():
-    return get_swagger_ui_html(
-        openapi_url=app.openapi_url,
-        title=app.title + " - API Documentation",
-        swagger_js_url="https://cdn.jsdelivr.net/npm/swagger-ui-dist@5/swagger-ui-bundle.js",
-        swagger_css_url="https://cdn.jsdelivr.net/npm/swagger-ui-dist@5/swagger-ui.css",
-        swagger_favicon_url="/favicon.ico",
-    )
+    return HTMLResponse(content=_SWAGGER_HTML)
+
+# Health check endpoint - body is constant, so it is serialized once at import
+_HEALTH_BODY = orjson.dumps({"status": "healthy", "environment": env})
 
-# Health check endpoint
-@app.get("/api/health")
-async def health_check():
+async def health_check(request):
     """Health check endpoint"""
-    return {"status": "healthy", "environment": env}
+    return Response(content=_HEALTH_BODY, media_type="application/json")
+
+app.add_route("/api/health", health_check, methods=["GET"], include_in_schema=False)
 
 # Import routers
 from src.api.routers import transactions, monthly_summary, categories, budgets, statistics, portfolio, financial_metrics
@@ -106,4 +150,37 @@ app.include_router(financial_metrics.router, prefix="/api/financial-metrics", ta
 @app.on_event("startup")
 async def startup_event():
     """Perform startup tasks"""
-    print(f"Finance Tracker API starting up... (Environment: {env})")
\ No newline at end of file
+    print(f"Finance Tracker API starting up... (Environment: {env})")
+    
+    # Open the first pooled SQLite connection now (runs the connect-time PRAGMAs)
+    # so the first request doesn't pay for it
+    session = get_db_session()
+    try:
+        schema_version = session.execute(text("PRAGMA user_version")).scalar()
+    finally:
+        session.close()
+    
+    # The repositories read and write amounts as integer cents; serving a database that
+    # still holds REAL dollars would misreport every amount, so migrate it first
+    if schema_version < SCHEMA_VERSION:
+        print(f"Database schema is at version {schema_version}, migrating to {SCHEMA_VERSION}...")
+        init_database(get_config_manager().get_categories().keys())
+    
+    # Parse config.yaml and build the cached services up front; keyword arguments
+    # in signature order match how FastAPI calls them, so the lru_cache entries are reused
+    get_import_service(
+        transaction_repo=get_transaction_repository(),
+        monthly_summary_repo=get_monthly_summary_repository(),
+        config=get_config_manager()
+    )
+    get_reporting_service(
+        transaction_repo=get_transaction_repository(),
+        monthly_summary_repo=get_monthly_summary_repository()
+    )
+    
+    # Create the statement upload directories once instead of on every upload
+    portfolio.ensure_upload_directories()
+    
+    # Build the OpenAPI schema now (app.openapi() stores it on app.openapi_schema)
+    # so the first /docs or /openapi.json hit doesn't walk every router and model
+    app.openapi()
\ No newline at end of file
@@ -1,10 +1,12 @@
 # src/api/routers/financial_metrics.py
 
+import asyncio
 from fastapi import APIRouter, Depends, Query
 from typing import Dict, List
 
 from src.api.dependencies import get_financial_metrics_service
 from src.services.financial_metrics_service import FinancialMetricsService
+from src.models.portfolio_models import Period
 
 router = APIRouter()
 
@@ -27,8 +29,13 @@ async def get_financial_metrics_overview(
     metrics_service: FinancialMetricsService = Depends(get_financial_metrics_service)
 ) -> Dict:
     """Get comprehensive financial metrics overview"""
-    runway = metrics_service.calculate_financial_runway()
-    net_worth = metrics_service.calculate_net_worth()
+    # Runway and investment totals query independent tables, so run them concurrently
+    # on worker threads; net worth is then combined from both without re-running the runway
+    runway, investment_assets = await asyncio.gather(
+        asyncio.to_thread(metrics_service.calculate_financial_runway),
+        asyncio.to_thread(metrics_service.calculate_investment_assets),
+    )
+    net_worth = metrics_service.combine_net_worth(runway["total_liquid_assets"], investment_assets)
 
     return {
         "runway": runway,
@@ -44,7 +51,7 @@ async def get_financial_metrics_overview(
 
 @router.get("/net-worth/history")
 async def get_historical_net_worth(
-    period: str = Query(default="2y", regex="^(6m|1y|2y|all)$"),
+    period: Period = Query(default=Period.TWO_YEARS),
     metrics_service: FinancialMetricsService = Depends(get_financial_metrics_service)
 ) -> List[Dict]:
     """
@@ -57,9 +64,12 @@ async def get_historical_net_worth(
     - Investment assets (portfolio excluding Wealthfront Cash)
 
     Args:
-        period: Time period ("6m", "1y", "2y", "all")
+        period: Time period ("6m", "1y", "2y", "5y", "all")
 
     Returns:
         List of monthly data points with real values
     """
-    return metrics_service.get_historical_net_worth(period=period)
\ No newline at end of file
+    # Built in full (on a worker thread) before responding, so a repository error is still
+    # a 500 with CORS headers rather than a truncated array behind a 200; it is only a few
+    # dozen monthly rows
+    return await asyncio.to_thread(metrics_service.get_historical_net_worth, period)
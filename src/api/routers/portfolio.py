@@ -1,31 +1,59 @@
 # src/api/routers/portfolio.py
 
-from fastapi import APIRouter, Depends, HTTPException, Query
-from typing import List, Optional, Dict
-from datetime import date
-from decimal import Decimal
-from datetime import datetime
-from pydantic import BaseModel, validator
-from typing import Optional, Dict
-from src.models.portfolio_models import PortfolioBalance, DataSource
+import asyncio
+import logging
 import os
 import re
-import uuid
-from fastapi import UploadFile, File, Form
-from fastapi.responses import FileResponse
-from pydantic import BaseModel
+import secrets
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from fastapi import APIRouter, Depends, File, Form, HTTPException, Query, Request, Response, UploadFile
+from fastapi.responses import FileResponse, ORJSONResponse
+from pydantic import BaseModel, validator
 
+from src.api.utils.response import DecimalORJSONResponse, dumps_json
+from src.utils.ttl_cache import TTLCache
 from src.api.dependencies import get_portfolio_service, get_portfolio_repository, get_bank_balance_repository
 from src.services.portfolio_service import PortfolioService
 from src.repositories.portfolio_repository import PortfolioRepository
-from src.repositories.bank_balance_repository import BankBalanceRepository  # ADD THIS IMPORT
+from src.repositories.bank_balance_repository import BankBalanceRepository
 from src.services.duplicate_detector import MonthlyDuplicateDetector, DuplicateCheckResult
-from src.models.portfolio_models import StatementUpload, BankBalance, DataSource
+from src.models.portfolio_models import (
+    PortfolioBalance, StatementUpload, BankBalance, DataSource, Period, period_start_date
+)
 from src.services.pdf_processor import PDFProcessor
 from src.services.statement_parser import StatementParser
 from database import get_db_session, StatementUploadModel
 
-router = APIRouter()
+logger = logging.getLogger(__name__)
+
+# Responses default to orjson; the heavy read endpoints also skip response_model
+# validation and only reference their models for the OpenAPI schema
+router = APIRouter(default_response_class=ORJSONResponse)
+
+def _to_decimal(value) -> Decimal:
+    """Convert an incoming amount to Decimal, skipping the str() round trip where it isn't needed"""
+    if isinstance(value, Decimal):
+        return value
+    if isinstance(value, int):
+        return Decimal(value)
+    if isinstance(value, float):
+        # repr is the shortest round-tripping form, so 0.1 becomes Decimal('0.1') rather than
+        # the exact binary value (same result as Decimal(str(value)))
+        return Decimal(repr(value))
+    return Decimal(value)
+
+def _schema_example(name: str):
+    """json_schema_extra hook that loads the OpenAPI example only when the schema is generated"""
+    def add_example(schema: Dict) -> None:
+        from src.api.schemas.portfolio_examples import PORTFOLIO_EXAMPLES
+        schema["example"] = PORTFOLIO_EXAMPLES[name]
+    return add_example
 
 class AccountPerformanceResponse(BaseModel):
     account_id: int
@@ -41,21 +69,7 @@ class AccountPerformanceResponse(BaseModel):
     period_months: int
     
     class Config:
-        json_schema_extra = {
-            "example": {
-                "account_id": 1,
-                "account_name": "401(k) Plan",
-                "institution": "ADP",
-                "account_type": "401k",
-                "start_balance": 200.01,
-                "end_balance": 15000.00,
-                "net_deposits": 12000.00,
-                "actual_growth": 2800.00,
-                "growth_percentage": 23.33,
-                "annualized_return": 8.5,
-                "period_months": 48
-            }
-        }
+        json_schema_extra = _schema_example("account_performance")
 
 class InstitutionSummaryResponse(BaseModel):
     institution: str
@@ -84,18 +98,7 @@ class PortfolioOverviewResponse(BaseModel):
     as_of_date: str
     
     class Config:
-        json_schema_extra = {
-            "example": {
-                "total_portfolio_value": 95000.00,
-                "total_deposits": 80000.00,
-                "total_growth": 15000.00,
-                "growth_percentage": 18.75,
-                "accounts": [],
-                "by_institution": [],
-                "by_account_type": [],
-                "as_of_date": "2024-06-06"
-            }
-        }
+        json_schema_extra = _schema_example("portfolio_overview")
 
 class PortfolioTrendsResponse(BaseModel):
     monthly_values: List[Dict]
@@ -104,52 +107,18 @@ class PortfolioTrendsResponse(BaseModel):
     worst_month: Optional[Dict]
     
     class Config:
-        json_schema_extra = {
-            "example": {
-                "monthly_values": [
-                    {
-                        "date": "2024-01-01",
-                        "month_display": "Jan 2024",
-                        "total_value": 90000.00,
-                        "wealthfront_investment": 25000.00,
-                        "schwab_brokerage": 30000.00
-                    }
-                ],
-                "growth_attribution": {},
-                "best_month": {
-                    "month_display": "May 2024",
-                    "total_value": 95000.00
-                },
-                "worst_month": {
-                    "month_display": "Jan 2024", 
-                    "total_value": 85000.00
-                }
-            }
-        }
+        json_schema_extra = _schema_example("portfolio_trends")
 
 class AccountListResponse(BaseModel):
     accounts: List[Dict]
     total_accounts: int
     
     class Config:
-        json_schema_extra = {
-            "example": {
-                "accounts": [
-                    {
-                        "id": 1,
-                        "account_name": "Wealthfront Investment",
-                        "institution": "Wealthfront",
-                        "account_type": "brokerage",
-                        "is_active": True
-                    }
-                ],
-                "total_accounts": 7
-            }
-        }
+        json_schema_extra = _schema_example("account_list")
 
 class ManualBalanceRequest(BaseModel):
     account_id: int
-    balance_date: str  # YYYY-MM-DD format
+    balance_date: date  # YYYY-MM-DD format, parsed once here
     balance_amount: float
     notes: Optional[str] = None
     
@@ -159,27 +128,44 @@ class ManualBalanceRequest(BaseModel):
             raise ValueError('Balance amount cannot be negative')
         return v
     
-    @validator('balance_date')
+    @validator('balance_date', pre=True)
     def validate_date(cls, v):
-        try:
-            balance_date = datetime.strptime(v, '%Y-%m-%d').date()
-            if balance_date > date.today():
-                raise ValueError('Balance date cannot be in the future')
-            return v
-        except ValueError:
-            raise ValueError('Invalid date format. Use YYYY-MM-DD')
-
-class BalanceConflictResponse(BaseModel):
+        if isinstance(v, str):
+            # date.fromisoformat is C-implemented; the length check keeps it to YYYY-MM-DD only
+            try:
+                if len(v) != 10:
+                    raise ValueError
+                v = date.fromisoformat(v)
+            except ValueError:
+                raise ValueError('Invalid date format. Use YYYY-MM-DD')
+        if isinstance(v, date) and v > date.today():
+            raise ValueError('Balance date cannot be in the future')
+        return v
+
+@dataclass
+class BalanceConflictResponse:
     has_conflict: bool
     existing_balance: Optional[Dict] = None
     conflict_type: Optional[str] = None  # "csv_import", "manual", "pdf_statement"
     message: Optional[str] = None
 
-class ManualBalanceSuccessResponse(BaseModel):
+@dataclass
+class ManualBalanceSuccessResponse:
     success: bool
     balance: Dict
     message: str
 
+class ManualBalanceBatchRequest(BaseModel):
+    items: List[ManualBalanceRequest]
+
+@dataclass
+class ManualBalanceBatchResponse:
+    success: bool
+    balances: List[Dict]
+    conflicts: List[Dict]
+    missing_accounts: List[int]
+    message: str
+
 class StatementUploadResponse(BaseModel):
     statement_id: int  # NEW: Always save to statement_uploads first
     extracted_data: Dict
@@ -191,6 +177,22 @@ class StatementUploadResponse(BaseModel):
     can_quick_save: bool
     duplicate_check: Optional[Dict] = None
 
+class SavedBalance(BaseModel):
+    id: int
+    account_id: int
+    balance_date: date
+    balance_amount: float
+    data_source: str
+    confidence_score: float
+    account_name: Optional[str] = None
+
+class BalanceSaveResponse(BaseModel):
+    success: bool
+    balance: Optional[SavedBalance] = None
+    message: str
+    requires_confirmation: Optional[bool] = None  # quick-save only, when a duplicate needs confirming
+    duplicate_info: Optional[Dict] = None
+
 class StatementReviewRequest(BaseModel):
     account_id: int
     balance_date: str  # YYYY-MM-DD
@@ -200,7 +202,20 @@ class StatementReviewRequest(BaseModel):
 class QuickSaveRequest(BaseModel):
     confirm_duplicates: bool = False  # If user wants to override duplicates
 
-@router.get("/overview", response_model=PortfolioOverviewResponse)
+# Serialized /trends bodies are reused for this many seconds. Keys include the balance and
+# transaction write counters, so any balance or transaction write is a cache miss. The
+# counters are per process: with several uvicorn workers, a write made in one worker
+# leaves the others' entries in place until RESPONSE_CACHE_TTL expires.
+RESPONSE_CACHE_TTL = 60
+RESPONSE_CACHE_SIZE = 64
+_response_cache = TTLCache(RESPONSE_CACHE_TTL, RESPONSE_CACHE_SIZE)
+
+def _cached_json(key: Tuple, build: Callable[[], Any]) -> Response:
+    """JSON response for key, built and serialized only when there is no fresh cached body"""
+    body = _response_cache.get_or_set(key, lambda: dumps_json(build()))
+    return Response(content=body, media_type="application/json")
+
+@router.get("/overview", response_model=None, responses={200: {"model": PortfolioOverviewResponse}})
 async def get_portfolio_overview(
     as_of_date: Optional[date] = Query(None, description="Portfolio value as of date (YYYY-MM-DD)"),
     portfolio_service: PortfolioService = Depends(get_portfolio_service)
@@ -210,61 +225,17 @@ async def get_portfolio_overview(
     
     Returns current portfolio value, growth, and performance by account, institution, and type.
     """
-    try:
-        overview = portfolio_service.get_portfolio_overview(as_of_date)
-        
-        # Convert to response format
-        return PortfolioOverviewResponse(
-            total_portfolio_value=float(overview.total_portfolio_value),
-            total_deposits=float(overview.total_deposits),
-            total_growth=float(overview.total_growth),
-            growth_percentage=float(overview.growth_percentage),
-            accounts=[
-                AccountPerformanceResponse(
-                    account_id=acc.account_id,
-                    account_name=acc.account_name,
-                    institution=acc.institution,
-                    account_type=acc.account_type.value,
-                    start_balance=float(acc.start_balance),
-                    end_balance=float(acc.end_balance),
-                    net_deposits=float(acc.net_deposits),
-                    actual_growth=float(acc.actual_growth),
-                    growth_percentage=float(acc.growth_percentage),
-                    annualized_return=float(acc.annualized_return),
-                    period_months=acc.period_months
-                ) for acc in overview.accounts
-            ],
-            by_institution=[
-                InstitutionSummaryResponse(
-                    institution=inst.institution,
-                    total_balance=float(inst.total_balance),
-                    total_growth=float(inst.total_growth),
-                    growth_percentage=float(inst.growth_percentage),
-                    account_count=inst.account_count,
-                    account_names=inst.account_names
-                ) for inst in overview.by_institution
-            ],
-            by_account_type=[
-                AccountTypeSummaryResponse(
-                    account_type=acc_type.account_type.value,
-                    total_balance=float(acc_type.total_balance),
-                    total_growth=float(acc_type.total_growth),
-                    growth_percentage=float(acc_type.growth_percentage),
-                    account_count=acc_type.account_count,
-                    account_names=acc_type.account_names
-                ) for acc_type in overview.by_account_type
-            ],
-            as_of_date=overview.as_of_date.isoformat()
-        )
-        
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error calculating portfolio overview: {str(e)}")
+    as_of_date = as_of_date or date.today()
+    
+    # The service memoizes the overview; its dataclasses already have the response's shape,
+    # so orjson serializes them directly, with Decimal amounts encoded as floats
+    return DecimalORJSONResponse(content=portfolio_service.get_portfolio_overview(as_of_date))
 
 
-@router.get("/performance/{account_id}", response_model=AccountPerformanceResponse)
+@router.get("/performance/{account_id}", response_model=None, responses={200: {"model": AccountPerformanceResponse}})
 async def get_account_performance(
     account_id: int,
-    period: str = Query("1y", description="Time period: 1y, 2y, 5y, all"),
+    period: Period = Query(Period.ONE_YEAR, description="Time period: 6m, 1y, 2y, 5y, all"),
     portfolio_service: PortfolioService = Depends(get_portfolio_service)
 ):
     """
@@ -272,51 +243,26 @@ async def get_account_performance(
     
     Returns ROI, growth attribution, and performance over the specified period.
     """
-    try:
-        # Calculate date range
-        end_date = date.today()
-        if period == "1y":
-            start_date = date(end_date.year - 1, end_date.month, end_date.day)
-        elif period == "2y":
-            start_date = date(end_date.year - 2, end_date.month, end_date.day)
-        elif period == "5y":
-            start_date = date(end_date.year - 5, end_date.month, end_date.day)
-        else:  # "all"
-            start_date = date(2020, 1, 1)
-        
-        performance = portfolio_service.calculate_account_performance(
-            account_id, start_date, end_date
-        )
-        
-        if not performance:
-            raise HTTPException(
-                status_code=404, 
-                detail=f"No performance data found for account {account_id}"
-            )
-        
-        return AccountPerformanceResponse(
-            account_id=performance.account_id,
-            account_name=performance.account_name,
-            institution=performance.institution,
-            account_type=performance.account_type.value,
-            start_balance=float(performance.start_balance),
-            end_balance=float(performance.end_balance),
-            net_deposits=float(performance.net_deposits),
-            actual_growth=float(performance.actual_growth),
-            growth_percentage=float(performance.growth_percentage),
-            annualized_return=float(performance.annualized_return),
-            period_months=performance.period_months
+    # Calculate date range
+    end_date = date.today()
+    start_date = period_start_date(end_date, period)
+    
+    performance = portfolio_service.calculate_account_performance(
+        account_id, start_date, end_date
+    )
+    
+    if not performance:
+        raise HTTPException(
+            status_code=404, 
+            detail=f"No performance data found for account {account_id}"
         )
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error calculating account performance: {str(e)}")
+    
+    return DecimalORJSONResponse(content=performance)
 
 
-@router.get("/trends", response_model=PortfolioTrendsResponse)
+@router.get("/trends", response_model=None, responses={200: {"model": PortfolioTrendsResponse}})
 async def get_portfolio_trends(
-    period: str = Query("1y", description="Time period: 1y, 2y, 5y, all"),
+    period: Period = Query(Period.ONE_YEAR, description="Time period: 6m, 1y, 2y, 5y, all"),
     portfolio_service: PortfolioService = Depends(get_portfolio_service)
 ):
     """
@@ -324,21 +270,28 @@ async def get_portfolio_trends(
     
     Returns monthly portfolio values and growth attribution data for charting.
     """
-    try:
+    def build_trends() -> Dict:
         trends = portfolio_service.get_portfolio_trends(period)
-        
-        return PortfolioTrendsResponse(
-            monthly_values=trends.monthly_values,
-            growth_attribution={k: float(v) for k, v in trends.growth_attribution.items()},
-            best_month=trends.best_month,
-            worst_month=trends.worst_month
-        )
-        
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error calculating portfolio trends: {str(e)}")
+        # Trend data is plain floats/strings already, so orjson serializes it directly
+        return {
+            "monthly_values": trends.monthly_values,
+            "growth_attribution": {k: float(v) for k, v in trends.growth_attribution.items()},
+            "best_month": trends.best_month,
+            "worst_month": trends.worst_month
+        }
+    
+    # Trends run up to today, so the date is part of the key as well
+    return _cached_json(
+        (
+            "trends", period, date.today(),
+            portfolio_service.portfolio_repo.balance_version,
+            portfolio_service.transaction_repo.write_version
+        ),
+        build_trends
+    )
 
 
-@router.get("/accounts", response_model=AccountListResponse)
+@router.get("/accounts", response_model=None, responses={200: {"model": AccountListResponse}})
 async def get_all_accounts(
     active_only: bool = Query(True, description="Return only active accounts"),
     portfolio_repo: PortfolioRepository = Depends(get_portfolio_repository)
@@ -348,26 +301,23 @@ async def get_all_accounts(
     
     Returns account details including name, institution, and type.
     """
-    try:
-        accounts = portfolio_repo.get_all_accounts(active_only=active_only)
-        
-        account_data = []
-        for account in accounts:
-            account_data.append({
-                "id": account.id,
-                "account_name": account.account_name,
-                "institution": account.institution,
-                "account_type": account.account_type.value,
-                "is_active": account.is_active
-            })
-        
-        return AccountListResponse(
-            accounts=account_data,
-            total_accounts=len(account_data)
-        )
-        
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error retrieving accounts: {str(e)}")
+    accounts = portfolio_repo.get_all_accounts_cards(active_only=active_only)
+    
+    account_data = []
+    for account in accounts:
+        account_data.append({
+            "id": account.id,
+            "account_name": account.account_name,
+            "institution": account.institution,
+            "account_type": account.account_type,
+            "is_active": account.is_active
+        })
+    
+    # Plain dicts go straight to orjson; AccountListResponse only documents the shape
+    return ORJSONResponse(content={
+        "accounts": account_data,
+        "total_accounts": len(account_data)
+    })
 
 
 @router.get("/institutions")
@@ -379,25 +329,12 @@ async def get_institution_breakdown(
     
     Returns aggregated performance data grouped by financial institution.
     """
-    try:
-        overview = portfolio_service.get_portfolio_overview()
-        
-        return {
-            "institutions": [
-                {
-                    "institution": inst.institution,
-                    "total_balance": float(inst.total_balance),
-                    "total_growth": float(inst.total_growth),
-                    "growth_percentage": float(inst.growth_percentage),
-                    "account_count": inst.account_count,
-                    "account_names": inst.account_names
-                } for inst in overview.by_institution
-            ],
-            "total_institutions": len(overview.by_institution)
-        }
-        
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error calculating institution breakdown: {str(e)}")
+    # Reads the service's memoized overview, so /overview and /institutions aggregate once
+    institutions = portfolio_service.get_institution_summary()
+    return DecimalORJSONResponse(content={
+        "institutions": institutions,
+        "total_institutions": len(institutions)
+    })
     
 @router.post("/balances")
 async def add_manual_balance(
@@ -408,77 +345,253 @@ async def add_manual_balance(
     """
     Add manual balance entry with duplicate detection and conflict resolution
     """
-    try:
-        # Convert string date to date object
-        balance_date = datetime.strptime(balance_request.balance_date, '%Y-%m-%d').date()
-        
-        # Check if account exists
-        account = portfolio_repo.get_account_by_id(balance_request.account_id)
+    balance_date = balance_request.balance_date
+    
+    # Account and any existing balance for the date come back from one query
+    account, existing = portfolio_repo.get_account_and_balance(balance_request.account_id, balance_date)
+    if not account:
+        raise HTTPException(status_code=404, detail=f"Account {balance_request.account_id} not found")
+    
+    # Create new balance
+    new_balance = PortfolioBalance(
+        account_id=balance_request.account_id,
+        balance_date=balance_date,
+        balance_amount=_to_decimal(balance_request.balance_amount),
+        data_source=DataSource.MANUAL,
+        notes=balance_request.notes
+    )
+    
+    if force_override:
+        # No conflict report needed: write (or overwrite) in one upsert statement
+        saved_balance, was_update = portfolio_repo.upsert_balance(new_balance)
+        return _manual_balance_success(saved_balance, account, was_update)
+    
+    if existing:
+        existing_source = existing.data_source.value
+        # Return conflict information for frontend to handle
+        return ORJSONResponse(content=BalanceConflictResponse(
+            has_conflict=True,
+            existing_balance={
+                "id": existing.id,
+                "balance_amount": float(existing.balance_amount),
+                "data_source": existing_source,
+                "notes": existing.notes,
+                "created_at": existing.created_at
+            },
+            conflict_type=existing_source,
+            message=f"Balance already exists for {account.account_name} on {balance_date}. "
+                   f"Existing balance: ${existing.balance_amount:,.2f} ({existing_source})"
+        ))
+    
+    saved_balance = portfolio_repo.save_balance(new_balance)
+    return _manual_balance_success(saved_balance, account, False)
+
+def _manual_balance_success(saved_balance, account, was_update: bool) -> ORJSONResponse:
+    """Success payload for a saved manual balance"""
+    return ORJSONResponse(content=ManualBalanceSuccessResponse(
+        success=True,
+        balance={
+            "id": saved_balance.id,
+            "account_id": saved_balance.account_id,
+            "balance_date": saved_balance.balance_date,
+            "balance_amount": float(saved_balance.balance_amount),
+            "data_source": saved_balance.data_source.value,
+            "notes": saved_balance.notes,
+            "account_name": account.account_name
+        },
+        message=f"Successfully {'updated' if was_update else 'added'} balance for {account.account_name}"
+    ))
+    
+@router.post("/balances/batch", response_model=None, responses={200: {"model": ManualBalanceBatchResponse}})
+async def add_manual_balances_batch(
+    batch_request: ManualBalanceBatchRequest,
+    force_override: bool = Query(False, description="Force override existing balances"),
+    portfolio_repo: PortfolioRepository = Depends(get_portfolio_repository)
+):
+    """
+    Add many manual balance entries at once
+    
+    Accounts and existing balances are looked up with one query each and all accepted
+    balances are written in a single statement. Entries that conflict with an existing
+    balance are returned (not saved) unless force_override is set.
+    """
+    items = batch_request.items
+    
+    # One query for all referenced accounts, one for all existing balances
+    accounts = portfolio_repo.get_accounts_by_ids([item.account_id for item in items])
+    existing_balances = portfolio_repo.check_balances_exist_bulk(
+        [(item.account_id, item.balance_date) for item in items if item.account_id in accounts]
+    )
+    
+    new_balances = {}
+    conflicts = []
+    missing_accounts = []
+    
+    for item in items:
+        balance_date = item.balance_date
+        account = accounts.get(item.account_id)
         if not account:
-            raise HTTPException(status_code=404, detail=f"Account {balance_request.account_id} not found")
-        
-        # Check for existing balance
-        existing = portfolio_repo.check_balance_exists(balance_request.account_id, balance_date)
+            if item.account_id not in missing_accounts:
+                missing_accounts.append(item.account_id)
+            continue
         
+        existing = existing_balances.get((item.account_id, balance_date))
         if existing and not force_override:
-            # Return conflict information for frontend to handle
-            return BalanceConflictResponse(
-                has_conflict=True,
-                existing_balance={
+            existing_source = existing.data_source.value
+            conflicts.append({
+                "account_id": item.account_id,
+                "account_name": account.account_name,
+                "balance_date": balance_date,
+                "existing_balance": {
                     "id": existing.id,
                     "balance_amount": float(existing.balance_amount),
-                    "data_source": existing.data_source.value,
+                    "data_source": existing_source,
                     "notes": existing.notes,
-                    "created_at": existing.created_at.isoformat() if existing.created_at else None
+                    "created_at": existing.created_at
                 },
-                conflict_type=existing.data_source.value,
-                message=f"Balance already exists for {account.account_name} on {balance_date}. "
-                       f"Existing balance: ${existing.balance_amount:,.2f} ({existing.data_source.value})"
-            )
+                "conflict_type": existing_source
+            })
+            continue
         
-        # Create new balance
-        new_balance = PortfolioBalance(
-            account_id=balance_request.account_id,
+        # A later entry for the same account and date wins, as it would sequentially
+        new_balances[(item.account_id, balance_date)] = PortfolioBalance(
+            account_id=item.account_id,
             balance_date=balance_date,
-            balance_amount=Decimal(str(balance_request.balance_amount)),
+            balance_amount=_to_decimal(item.balance_amount),
             data_source=DataSource.MANUAL,
-            notes=balance_request.notes
+            notes=item.notes
         )
-        
-        # Save balance (will update if exists due to repository logic)
-        saved_balance = portfolio_repo.save_balance(new_balance)
-        
-        return ManualBalanceSuccessResponse(
-            success=True,
-            balance={
+    
+    saved_balances = portfolio_repo.save_balances(list(new_balances.values()))
+    
+    return ORJSONResponse(content=ManualBalanceBatchResponse(
+        success=not conflicts and not missing_accounts,
+        balances=[
+            {
                 "id": saved_balance.id,
                 "account_id": saved_balance.account_id,
-                "balance_date": saved_balance.balance_date.isoformat(),
+                "balance_date": saved_balance.balance_date,
                 "balance_amount": float(saved_balance.balance_amount),
                 "data_source": saved_balance.data_source.value,
                 "notes": saved_balance.notes,
-                "account_name": account.account_name
-            },
-            message=f"Successfully {'updated' if existing else 'added'} balance for {account.account_name}"
-        )
-        
-    except ValueError as e:
-        raise HTTPException(status_code=400, detail=str(e))
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error adding manual balance: {str(e)}")
+                "account_name": accounts[saved_balance.account_id].account_name
+            } for saved_balance in saved_balances
+        ],
+        conflicts=conflicts,
+        missing_accounts=missing_accounts,
+        message=f"Saved {len(saved_balances)} balance(s), {len(conflicts)} conflict(s), "
+                f"{len(missing_accounts)} unknown account(s)"
+    ))
     
 # Storage configuration
 UPLOAD_BASE_DIR = "uploaded_statements"
 SINGLE_PAGE_DIR = "single_pages"
+SINGLE_PAGE_UPLOAD_DIR = os.path.join(UPLOAD_BASE_DIR, SINGLE_PAGE_DIR)
 
 def ensure_upload_directories():
-    """Ensure upload directories exist"""
+    """Ensure upload directories exist (called once at application startup)"""
     os.makedirs(UPLOAD_BASE_DIR, exist_ok=True)
-    os.makedirs(os.path.join(UPLOAD_BASE_DIR, SINGLE_PAGE_DIR), exist_ok=True)
+    os.makedirs(SINGLE_PAGE_UPLOAD_DIR, exist_ok=True)
+
+
+def accel_redirect_location(pdf_path: str) -> Optional[str]:
+    """
+    Internal location for a reverse proxy to serve pdf_path from, or None to serve it here.
+
+    Set PDF_ACCEL_REDIRECT_PREFIX (e.g. "/protected-statements/") when nginx maps that
+    location onto UPLOAD_BASE_DIR; leave it unset for local development without a proxy.
+    """
+    prefix = os.getenv("PDF_ACCEL_REDIRECT_PREFIX")
+    if not prefix:
+        return None
+    relative_path = os.path.relpath(pdf_path, UPLOAD_BASE_DIR)
+    if relative_path.startswith(os.pardir):
+        return None
+    return prefix.rstrip("/") + "/" + relative_path.replace(os.sep, "/")
+
+# Statement uploads must have a .pdf extension (any case); checked without lowercasing the name
+PDF_FILENAME_RE = re.compile(r"\.pdf\Z", re.IGNORECASE)
+
+# Reviewed statement dates must be plain YYYY-MM-DD (fromisoformat alone also accepts other ISO forms)
+_DATE_RE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+
+
+def parse_balance_date(value: str) -> date:
+    """Parse a reviewed statement's balance_date, rejecting anything but YYYY-MM-DD"""
+    try:
+        if not _DATE_RE.match(value):
+            raise ValueError
+        return date.fromisoformat(value)
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid balance_date; expected YYYY-MM-DD")
+
+# Uploads are copied to disk in chunks of this size rather than read into memory whole
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+async def save_upload(file: UploadFile, path: str):
+    """Stream an uploaded file to path"""
+    with open(path, "wb") as buffer:
+        while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+            buffer.write(chunk)
+
+def remove_files(*paths: str):
+    """Best-effort delete of upload files; missing files are ignored"""
+    for path in paths:
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+
+# PDF rendering, OCR and parsing are blocking and CPU-heavy, so they run on a dedicated pool
+# (one worker per core) instead of the event loop, keeping other requests responsive
+_pdf_executor = ThreadPoolExecutor(max_workers=os.cpu_count(), thread_name_prefix="pdf")
+
+async def run_pdf_task(func, *args):
+    """Run a blocking PDF/OCR call on the PDF worker pool"""
+    return await asyncio.get_running_loop().run_in_executor(_pdf_executor, func, *args)
+
+# The processors only hold configuration set up in __init__ (extractor tables, keyword lists,
+# thresholds), so one shared instance of each serves every request
+pdf_processor = PDFProcessor()
+statement_parser = StatementParser()
+duplicate_detector = MonthlyDuplicateDetector()
+    
+# Monthly duplicate checks made at upload time, by statement id. Quick-save reuses one while
+# it is fresh and no balance has been written since (the repository's balance version is
+# unchanged), instead of re-running the same query right after the upload.
+DUPLICATE_CHECK_TTL = 300
+DUPLICATE_CHECK_CACHE_SIZE = 256
+_upload_duplicate_checks = TTLCache(DUPLICATE_CHECK_TTL, DUPLICATE_CHECK_CACHE_SIZE)
+
+def remember_duplicate_check(statement_id: int, balance_version: int, key: Tuple, result: DuplicateCheckResult):
+    """Keep an upload's duplicate check for quick-save (key is (account_id, statement_date))"""
+    _upload_duplicate_checks.set((statement_id, balance_version, key), result)
+
+def cached_duplicate_check(statement_id: int, balance_version: int, key: Tuple) -> Optional[DuplicateCheckResult]:
+    """The upload's duplicate check for statement_id, if it still holds"""
+    return _upload_duplicate_checks.get((statement_id, balance_version, key))
     
-def match_account_intelligently(statement_data, all_accounts):
+# Statement-to-account matching rules as (institution substring, account type keywords,
+# target account name substring). Checked in order, so more specific rules come first;
+# an empty keyword tuple matches on institution alone.
+ACCOUNT_MATCHING_RULES = (
+    # Schwab Roth - must come FIRST (more specific)
+    ('schwab', ('roth ira', 'roth contributory ira', 'contributory ira'), 'roth ira'),
+    # Schwab Brokerage - less specific, comes after
+    ('schwab', ('schwab one account', 'brokerage', 'investment account'), 'schwab brokerage'),
+    # Wealthfront rules
+    ('wealthfront', ('individual investment account', 'investment'), 'wealthfront investment'),
+    ('wealthfront', ('cash account', 'savings', 'cash'), 'wealthfront cash'),
+    # Other institutions (simple matching)
+    ('acorns', (), 'acorns'),
+    ('robinhood', (), 'robinhood'),
+)
+
+def match_account_intelligently(statement_data, account_index):
     """
     Enhanced account matching based on institution AND account type
+    
+    account_index is the repository's AccountMatchIndex (accounts with pre-lowercased names)
     """
     if not statement_data.institution:
         return None, []
@@ -486,72 +599,29 @@ def match_account_intelligently(statement_data, all_accounts):
     institution = statement_data.institution.lower()
     account_type = (statement_data.account_type or "").lower()
     
-    print(f"🎯 Matching account for: {institution} - {account_type}")
-    
-    # Define specific matching rules based on our patterns
-    matching_rules = [
-        # Schwab Roth - must come FIRST (more specific)
-        {
-            'institution': 'schwab',
-            'account_type_keywords': ['roth ira', 'roth contributory ira', 'contributory ira'],
-            'target_name': 'roth ira'
-        },
-        # Schwab Brokerage - less specific, comes after
-        {
-            'institution': 'schwab',
-            'account_type_keywords': ['schwab one account', 'brokerage', 'investment account'],
-            'target_name': 'schwab brokerage'
-        },
-        # Wealthfront rules
-        {
-            'institution': 'wealthfront',
-            'account_type_keywords': ['individual investment account', 'investment'],
-            'target_name': 'wealthfront investment'
-        },
-        {
-            'institution': 'wealthfront', 
-            'account_type_keywords': ['cash account', 'savings', 'cash'],
-            'target_name': 'wealthfront cash'
-        },
-        # Other institutions (simple matching)
-        {
-            'institution': 'acorns',
-            'account_type_keywords': [],  # Any account type
-            'target_name': 'acorns'
-        },
-        {
-            'institution': 'robinhood',
-            'account_type_keywords': [],
-            'target_name': 'robinhood'
-        }
-    ]
+    logger.debug("Matching account for: %s - %s", institution, account_type)
     
     # Try rule-based matching first
-    for rule in matching_rules:
-        if rule['institution'] in institution:
-            # If no specific account type rules, match by institution only
-            if not rule['account_type_keywords']:
-                for account in all_accounts:
-                    if rule['target_name'] in account.account_name.lower():
-                        print(f"✅ Rule match: {account.account_name} (institution-only)")
-                        return account, []
-            else:
-                # Check if account type matches any keywords
-                for keyword in rule['account_type_keywords']:
-                    if keyword in account_type:
-                        for account in all_accounts:
-                            if rule['target_name'] in account.account_name.lower():
-                                print(f"✅ Rule match: {account.account_name} (type: {keyword})")
-                                return account, []
+    for rule_institution, keywords, target_name in ACCOUNT_MATCHING_RULES:
+        if rule_institution not in institution:
+            continue
+        
+        # Every keyword of a rule points at the same account, so only the first hit matters
+        keyword = next((k for k in keywords if k in account_type), None)
+        if keywords and keyword is None:
+            continue
+        
+        for account_name_lower, account in zip(account_index.names_lower, account_index.accounts):
+            if target_name in account_name_lower:
+                match_reason = f"type: {keyword}" if keyword else "institution-only"
+                logger.debug("Rule match: %s (%s)", account.account_name, match_reason)
+                return account, []
     
     # Fallback: Try institution-only matching for exact matches
     exact_matches = []
     partial_matches = []
     
-    for account in all_accounts:
-        account_name_lower = account.account_name.lower()
-        account_institution_lower = account.institution.lower()
-        
+    for account_institution_lower, account in zip(account_index.institutions_lower, account_index.accounts):
         # Exact institution match
         if institution == account_institution_lower:
             exact_matches.append(account)
@@ -561,16 +631,18 @@ def match_account_intelligently(statement_data, all_accounts):
     
     # Return best match
     if len(exact_matches) == 1:
-        print(f"✅ Exact institution match: {exact_matches[0].account_name}")
+        logger.debug("Exact institution match: %s", exact_matches[0].account_name)
         return exact_matches[0], []
     elif exact_matches:
-        print(f"⚠️ Multiple exact matches found: {[acc.account_name for acc in exact_matches]}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Multiple exact matches found: %s", [acc.account_name for acc in exact_matches])
         return exact_matches[0], exact_matches[1:]  # Return first as match, rest as suggestions
     elif partial_matches:
-        print(f"⚠️ Partial matches found: {[acc.account_name for acc in partial_matches]}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Partial matches found: %s", [acc.account_name for acc in partial_matches])
         return None, partial_matches
     
-    print(f"❌ No matches found for {institution}")
+    logger.debug("No matches found for %s", institution)
     return None, []
 
 @router.post("/bank-statements/upload")
@@ -585,27 +657,23 @@ async def upload_bank_statement(
     """
     try:
         # Validate file
-        if not file.filename.lower().endswith('.pdf'):
+        if not PDF_FILENAME_RE.search(file.filename):
             raise HTTPException(status_code=400, detail="Only PDF files are supported for bank statements")
         
-        ensure_upload_directories()
-        
         # Create unique filename
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        unique_id = str(uuid.uuid4())[:8]
+        timestamp = time.strftime("%Y%m%d_%H%M%S")
+        unique_id = secrets.token_hex(4)
         safe_filename = f"bank_{timestamp}_{unique_id}_{file.filename}"
         full_pdf_path = os.path.join(UPLOAD_BASE_DIR, safe_filename)
         
         # Save full PDF
-        with open(full_pdf_path, "wb") as buffer:
-            content = await file.read()
-            buffer.write(content)
-        
-        print(f"📄 Saved bank statement PDF: {full_pdf_path}")
+        await save_upload(file, full_pdf_path)
         
-        pdf_processor = PDFProcessor()
+        logger.debug("Saved bank statement PDF: %s", full_pdf_path)
         
-        extracted_text, extraction_confidence, relevant_page, total_pages = pdf_processor.extract_wells_fargo_bank_statement(full_pdf_path)
+        extracted_text, extraction_confidence, relevant_page, total_pages = await run_pdf_task(
+            pdf_processor.extract_wells_fargo_bank_statement, full_pdf_path
+        )
         
         
         if not extracted_text or extraction_confidence < 0.2:
@@ -616,10 +684,9 @@ async def upload_bank_statement(
                 "total_pages": total_pages
             }
         
-        parser = StatementParser()
-        statement_data = parser.parse_statement(extracted_text)
+        statement_data = await run_pdf_task(statement_parser.parse_statement, extracted_text)
         
-        print(f"🏦 Bank parsing results: institution={statement_data.institution}, confidence={statement_data.confidence_score:.2f}")
+        logger.debug("Bank parsing results: institution=%s, confidence=%.2f", statement_data.institution, statement_data.confidence_score)
         
         if statement_data.institution != 'wells_fargo':
             return {
@@ -657,7 +724,7 @@ async def upload_bank_statement(
                 "extracted_data": {
                     "beginning_balance": float(statement_data.beginning_balance) if statement_data.beginning_balance else None,
                     "ending_balance": float(statement_data.ending_balance) if statement_data.ending_balance else None,
-                    "statement_date": statement_date.isoformat() if statement_date else None
+                    "statement_date": statement_date
                 }
             }
 
@@ -673,11 +740,9 @@ async def upload_bank_statement(
             withdrawals_subtractions=withdrawals_amount,
             statement_date=statement_date,  # FIXED: Use the correct date
             data_source="pdf_statement",
-            confidence_score=Decimal(str(statement_data.confidence_score)),
+            confidence_score=_to_decimal(statement_data.confidence_score),
             notes=f"Auto-extracted from {file.filename}"
         )
-
-        duplicate_detector = MonthlyDuplicateDetector()
         
         try:
             saved_balance = bank_repo.save(bank_balance)
@@ -688,7 +753,7 @@ async def upload_bank_statement(
                 duplicate_result = duplicate_detector.check_bank_monthly_duplicates(
                     "Wells Fargo Checking",
                     statement_month,
-                    Decimal(str(statement_data.ending_balance)), 
+                    _to_decimal(statement_data.ending_balance), 
                     statement_date
                 )
                 
@@ -704,7 +769,7 @@ async def upload_bank_statement(
                     "extracted_balance": {
                         "statement_month": statement_month,
                         "ending_balance": float(statement_data.ending_balance),
-                        "statement_date": statement_date.isoformat(),
+                        "statement_date": statement_date,
                         "data_source": "pdf_statement",
                         "confidence_score": float(statement_data.confidence_score)
                     },
@@ -721,7 +786,7 @@ async def upload_bank_statement(
             # Unexpected database errors
             raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
         
-        print(f"💾 Saved bank balance: {saved_balance.account_name} {saved_balance.statement_month}")
+        logger.debug("Saved bank balance: %s %s", saved_balance.account_name, saved_balance.statement_month)
         
         return {
             "success": True,
@@ -730,7 +795,7 @@ async def upload_bank_statement(
                 "id": saved_balance.id, 
                 "account_name": saved_balance.account_name,
                 "statement_month": saved_balance.statement_month,
-                "statement_date": saved_balance.statement_date.isoformat(),
+                "statement_date": saved_balance.statement_date,
                 "beginning_balance": float(saved_balance.beginning_balance),
                 "ending_balance": float(saved_balance.ending_balance),
                 "deposits_additions": float(saved_balance.deposits_additions) if saved_balance.deposits_additions else None,
@@ -745,7 +810,7 @@ async def upload_bank_statement(
         }
         
     except Exception as e:
-        print(f"❌ Error processing bank statement: {str(e)}")
+        logger.error("Error processing bank statement: %s", e)
         raise HTTPException(status_code=500, detail=f"Error processing bank statement: {str(e)}")
 
 @router.get("/bank-balances")
@@ -753,33 +818,32 @@ async def get_bank_balances(
     bank_repo: BankBalanceRepository = Depends(get_bank_balance_repository)
 ):
     """Get all bank balances for visualization"""
-    try:
-        balances = bank_repo.get_all_balances()
-        
-        return {
-            "success": True,
-            "balances": [
-                {
-                    "id": balance.id,
-                    "account_name": balance.account_name,
-                    "statement_month": balance.statement_month,
-                    "beginning_balance": float(balance.beginning_balance),
-                    "ending_balance": float(balance.ending_balance),
-                    "deposits_additions": float(balance.deposits_additions) if balance.deposits_additions else None,
-                    "withdrawals_subtractions": float(balance.withdrawals_subtractions) if balance.withdrawals_subtractions else None,
-                    "statement_date": balance.statement_date.isoformat(),
-                    "data_source": balance.data_source,
-                    "confidence_score": float(balance.confidence_score),
-                    "created_at": balance.created_at.isoformat() if balance.created_at else None
-                }
-                for balance in balances
-            ],
-            "total_records": len(balances)
-        }
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error fetching bank balances: {str(e)}")
+    balances = bank_repo.get_all_balances()
+    
+    return {
+        "success": True,
+        "balances": [
+            {
+                "id": balance.id,
+                "account_name": balance.account_name,
+                "statement_month": balance.statement_month,
+                "beginning_balance": float(balance.beginning_balance),
+                "ending_balance": float(balance.ending_balance),
+                "deposits_additions": float(balance.deposits_additions) if balance.deposits_additions else None,
+                "withdrawals_subtractions": float(balance.withdrawals_subtractions) if balance.withdrawals_subtractions else None,
+                "statement_date": balance.statement_date,
+                "data_source": balance.data_source,
+                "confidence_score": float(balance.confidence_score),
+                "created_at": balance.created_at
+            }
+            for balance in balances
+        ],
+        "total_records": len(balances)
+    }
 
-@router.post("/statements/upload", response_model=StatementUploadResponse)
+# The upload response is assembled from already-typed extraction results, so it is built with
+# model_construct and not re-validated on the way out; the model only documents the schema
+@router.post("/statements/upload", response_model=None, responses={200: {"model": StatementUploadResponse}})
 async def upload_statement_with_page_detection(
     file: UploadFile = File(...),
     portfolio_repo: PortfolioRepository = Depends(get_portfolio_repository)
@@ -793,29 +857,27 @@ async def upload_statement_with_page_detection(
     3. Save to statement_uploads → Return options for user
     4. User chooses: Quick Save or Review
     """
+    # Set up front so the error handler knows which files exist
+    full_pdf_path = None
+    single_page_path = None
+    
     try:
         # Validate file
-        if not file.filename.lower().endswith('.pdf'):
+        if not PDF_FILENAME_RE.search(file.filename):
             raise HTTPException(status_code=400, detail="Only PDF files are supported")
         
-        ensure_upload_directories()
-        
         # Create unique filename to avoid conflicts
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        unique_id = str(uuid.uuid4())[:8]
+        timestamp = time.strftime("%Y%m%d_%H%M%S")
+        unique_id = secrets.token_hex(4)
         safe_filename = f"{timestamp}_{unique_id}_{file.filename}"
         full_pdf_path = os.path.join(UPLOAD_BASE_DIR, safe_filename)
         
         # Save full PDF
-        with open(full_pdf_path, "wb") as buffer:
-            content = await file.read()
-            buffer.write(content)
+        await save_upload(file, full_pdf_path)
         
-        print(f"📄 Saved full PDF: {full_pdf_path}")
+        logger.debug("Saved full PDF: %s", full_pdf_path)
         
         # Enhanced duplicate detection - FILENAME CHECK FIRST
-        duplicate_detector = MonthlyDuplicateDetector()
-        
         # Layer 1: Filename check - DO THIS BEFORE OCR PROCESSING
         filename_check = duplicate_detector.check_filename_duplicates(file.filename)
         
@@ -848,7 +910,6 @@ async def upload_statement_with_page_detection(
                     # The constraint is already working - find the existing record
                     session = get_db_session()
                     try:
-                        from database import StatementUploadModel
                         existing = session.query(StatementUploadModel).filter(
                             StatementUploadModel.original_filename == file.filename
                         ).first()
@@ -858,7 +919,7 @@ async def upload_statement_with_page_detection(
                 else:
                     statement_id_to_return = 0
             
-            return StatementUploadResponse(
+            return StatementUploadResponse.model_construct(
                 statement_id=statement_id_to_return,
                 extracted_data={
                     "duplicate_checks": {
@@ -882,11 +943,12 @@ async def upload_statement_with_page_detection(
                 requires_review=True,
                 message=f"File '{file.filename}' was already uploaded previously",
                 can_quick_save=False,
-                duplicate_check=filename_check.__dict__
+                duplicate_check=filename_check.to_response_dict()
             )
         
-        pdf_processor = PDFProcessor()
-        extracted_text, extraction_confidence, relevant_page, total_pages = pdf_processor.extract_with_page_detection(full_pdf_path)
+        extracted_text, extraction_confidence, relevant_page, total_pages = await run_pdf_task(
+            pdf_processor.extract_with_page_detection, full_pdf_path
+        )
 
         
         if not extracted_text or extraction_confidence < 0.2:
@@ -901,7 +963,7 @@ async def upload_statement_with_page_detection(
             
             saved_upload = portfolio_repo.save_statement_upload(failed_upload)
             
-            return StatementUploadResponse(
+            return StatementUploadResponse.model_construct(
                 statement_id=saved_upload.id,
                 extracted_data={},
                 confidence_score=extraction_confidence,
@@ -913,29 +975,28 @@ async def upload_statement_with_page_detection(
             )
         
         single_page_filename = f"page_{relevant_page}_{safe_filename}"
-        single_page_path = os.path.join(UPLOAD_BASE_DIR, SINGLE_PAGE_DIR, single_page_filename)
+        single_page_path = os.path.join(SINGLE_PAGE_UPLOAD_DIR, single_page_filename)
         
-        page_extraction_success = pdf_processor.extract_single_page_pdf(
-            full_pdf_path, relevant_page, single_page_path
+        # Writing the single-page PDF and parsing the OCR text are independent, so both run at once
+        page_extraction_success, statement_data = await asyncio.gather(
+            run_pdf_task(pdf_processor.extract_single_page_pdf, full_pdf_path, relevant_page, single_page_path),
+            run_pdf_task(statement_parser.parse_statement, extracted_text)
         )
         
         if page_extraction_success:
-            print(f"📑 Extracted single page: {single_page_path}")
+            logger.debug("Extracted single page: %s", single_page_path)
         else:
-            print(f"⚠️ Failed to extract single page, will use full PDF for review")
+            logger.warning("Failed to extract single page, will use full PDF for review")
             single_page_path = None
         
-        statement_parser = StatementParser()
-        statement_data = statement_parser.parse_statement(extracted_text)
-        
         overall_confidence = (extraction_confidence * 0.3) + (statement_data.confidence_score * 0.7)
         
         account = None
         account_suggestions = []
 
         if statement_data.institution:
-            all_accounts = portfolio_repo.get_all_accounts()
-            account, suggestions = match_account_intelligently(statement_data, all_accounts)
+            account_index = portfolio_repo.get_account_match_index()
+            account, suggestions = match_account_intelligently(statement_data, account_index)
             
             # Format suggestions for frontend
             for acc in suggestions:
@@ -947,6 +1008,8 @@ async def upload_statement_with_page_detection(
                 })
         
         monthly_duplicate_check = None
+        # Read before the check, so a balance written while it runs makes the cached result stale
+        balance_version = portfolio_repo.balance_version
         if (account and statement_data.ending_balance and statement_data.statement_period_end):
             monthly_duplicate_check = duplicate_detector.check_monthly_duplicates(
                 account.id,
@@ -978,12 +1041,20 @@ async def upload_statement_with_page_detection(
         
         try:
             saved_upload = portfolio_repo.save_statement_upload(statement_upload)
-            print(f"💾 Saved statement upload: ID {saved_upload.id}")
+            logger.debug("Saved statement upload: ID %s", saved_upload.id)
+            
+            if statement_upload.account_id:
+                remember_duplicate_check(
+                    saved_upload.id,
+                    balance_version,
+                    (statement_upload.account_id, statement_upload.statement_date),
+                    monthly_duplicate_check
+                )
         except Exception as e:
             # Handle filename duplicate error gracefully
             if "UNIQUE constraint failed: statement_uploads.original_filename" in str(e):
                 # This is a filename duplicate - return appropriate response
-                return StatementUploadResponse(
+                return StatementUploadResponse.model_construct(
                     statement_id=0,  # No statement saved
                     extracted_data={
                         "duplicate_checks": {
@@ -1016,8 +1087,8 @@ async def upload_statement_with_page_detection(
         extracted_data = {
             "institution": statement_data.institution,
             "account_type": statement_data.account_type,
-            "statement_period_start": statement_data.statement_period_start.isoformat() if statement_data.statement_period_start else None,
-            "statement_period_end": statement_data.statement_period_end.isoformat() if statement_data.statement_period_end else None,
+            "statement_period_start": statement_data.statement_period_start,
+            "statement_period_end": statement_data.statement_period_end,
             "confidence_score": overall_confidence,
             "duplicate_checks": {
                 "filename_duplicate": {
@@ -1067,7 +1138,7 @@ async def upload_statement_with_page_detection(
         else:
             message = "Manual review required due to low confidence or missing data."
         
-        return StatementUploadResponse(
+        return StatementUploadResponse.model_construct(
             statement_id=saved_upload.id,
             extracted_data=extracted_data,
             confidence_score=overall_confidence,
@@ -1076,22 +1147,23 @@ async def upload_statement_with_page_detection(
             requires_review=requires_review,
             message=message,
             can_quick_save=can_quick_save,
-            duplicate_check=monthly_duplicate_check.__dict__ if monthly_duplicate_check else None
+            duplicate_check=monthly_duplicate_check.to_response_dict() if monthly_duplicate_check else None
         )
         
     except Exception as e:
-        # Clean up files on error
-        try:
-            if 'full_pdf_path' in locals() and os.path.exists(full_pdf_path):
-                os.unlink(full_pdf_path)
-            if 'single_page_path' in locals() and single_page_path and os.path.exists(single_page_path):
-                os.unlink(single_page_path)
-        except:
-            pass
-        
+        # Clean up files on error, in a worker thread so the event loop isn't blocked on disk I/O
+        cleanup_paths = [path for path in (full_pdf_path, single_page_path) if path]
+        if cleanup_paths:
+            await asyncio.to_thread(remove_files, *cleanup_paths)
+        
+        # Deliberate 4xx responses (e.g. a non-PDF upload) pass through unchanged
+        if isinstance(e, HTTPException):
+            raise
         raise HTTPException(status_code=500, detail=f"Error processing statement: {str(e)}")
 
-@router.post("/statements/confirm")
+# The statement save endpoints return ORJSONResponse directly; BalanceSaveResponse only
+# documents the payload, so responses are not re-validated on the way out
+@router.post("/statements/confirm", response_model=None, responses={200: {"model": BalanceSaveResponse}})
 async def confirm_statement_extraction(
     statement_data: StatementReviewRequest,
     portfolio_repo: PortfolioRepository = Depends(get_portfolio_repository)
@@ -1099,53 +1171,47 @@ async def confirm_statement_extraction(
     """
     Confirm and save statement data after user review
     """
-    try:
-        # Convert to balance entry (reuse manual balance logic)
-        balance_date = datetime.strptime(statement_data.balance_date, '%Y-%m-%d').date()
-        
-        # Check if account exists
-        account = portfolio_repo.get_account_by_id(statement_data.account_id)
-        if not account:
-            raise HTTPException(status_code=404, detail=f"Account {statement_data.account_id} not found")
-        
-        # Check for existing balance
-        existing = portfolio_repo.check_balance_exists(statement_data.account_id, balance_date)
-        
-        # Create balance entry
-        new_balance = PortfolioBalance(
-            account_id=statement_data.account_id,
-            balance_date=balance_date,
-            balance_amount=Decimal(str(statement_data.balance_amount)),
-            data_source=DataSource.PDF_STATEMENT,
-            confidence_score=Decimal(str(statement_data.confidence_score)),
-            notes=f"PDF: {statement_data.original_filename}" + (f" | {statement_data.notes}" if statement_data.notes else "")
-        )
-        
-        # Save balance
-        saved_balance = portfolio_repo.save_balance(new_balance)
-        
-        action = "updated" if existing else "added"
-        
-        return {
-            "success": True,
-            "balance": {
-                "id": saved_balance.id,
-                "account_id": saved_balance.account_id,
-                "balance_date": saved_balance.balance_date.isoformat(),
-                "balance_amount": float(saved_balance.balance_amount),
-                "data_source": saved_balance.data_source.value,
-                "confidence_score": float(saved_balance.confidence_score),
-                "account_name": account.account_name
-            },
-            "message": f"Successfully {action} balance from PDF statement"
-        }
-        
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error saving statement data: {str(e)}")
+    # Convert to balance entry (reuse manual balance logic)
+    balance_date = parse_balance_date(statement_data.balance_date)
+    
+    # Account and any existing balance for the date come back from one query
+    account, existing = portfolio_repo.get_account_and_balance(statement_data.account_id, balance_date)
+    if not account:
+        raise HTTPException(status_code=404, detail=f"Account {statement_data.account_id} not found")
+    
+    # Create balance entry
+    new_balance = PortfolioBalance(
+        account_id=statement_data.account_id,
+        balance_date=balance_date,
+        balance_amount=_to_decimal(statement_data.balance_amount),
+        data_source=DataSource.PDF_STATEMENT,
+        confidence_score=_to_decimal(statement_data.confidence_score),
+        notes=f"PDF: {statement_data.original_filename}{' | ' + statement_data.notes if statement_data.notes else ''}"
+    )
     
+    # Save balance
+    saved_balance = portfolio_repo.save_balance(new_balance)
+    
+    action = "updated" if existing else "added"
+    
+    return ORJSONResponse(content={
+        "success": True,
+        "balance": {
+            "id": saved_balance.id,
+            "account_id": saved_balance.account_id,
+            "balance_date": saved_balance.balance_date,
+            "balance_amount": float(saved_balance.balance_amount),
+            "data_source": saved_balance.data_source.value,
+            "confidence_score": float(saved_balance.confidence_score),
+            "account_name": account.account_name
+        },
+        "message": f"Successfully {action} balance from PDF statement"
+    })
+
 @router.get("/statements/{statement_id}/page-pdf")
 async def serve_single_page_pdf(
     statement_id: int,
+    request: Request,
     portfolio_repo: PortfolioRepository = Depends(get_portfolio_repository)
 ):
     """
@@ -1159,12 +1225,36 @@ async def serve_single_page_pdf(
         # Use single page PDF if available, otherwise full PDF
         pdf_path = statement.page_pdf_path if statement.page_pdf_path else statement.file_path
         
-        if not pdf_path or not os.path.exists(pdf_path):
+        if not pdf_path:
+            raise HTTPException(status_code=404, detail="PDF file not found")
+        
+        # stat in a worker thread; passing the result on spares FileResponse its own blocking stat
+        try:
+            stat_result = await asyncio.to_thread(os.stat, pdf_path)
+        except FileNotFoundError:
             raise HTTPException(status_code=404, detail="PDF file not found")
         
+        # Statement PDFs don't change once written, so the review UI can revalidate with a 304
+        headers = {
+            "Accept-Ranges": "bytes",
+            "Cache-Control": "private, max-age=3600",
+            "ETag": f'"{statement_id}-{stat_result.st_mtime_ns}"'
+        }
+        if request.headers.get("if-none-match") == headers["ETag"]:
+            return Response(status_code=304, headers=headers)
+        
+        # Behind nginx, hand the file off entirely instead of streaming it through the worker
+        accel_location = accel_redirect_location(pdf_path)
+        if accel_location:
+            headers["X-Accel-Redirect"] = accel_location
+            return Response(media_type="application/pdf", headers=headers)
+        
+        # FileResponse uses the server's zero-copy sendfile extension when one is offered
         return FileResponse(
             pdf_path,
-            media_type="application/pdf"
+            media_type="application/pdf",
+            headers=headers,
+            stat_result=stat_result
         )
         
     except HTTPException:
@@ -1173,7 +1263,7 @@ async def serve_single_page_pdf(
         raise HTTPException(status_code=500, detail=f"Error serving PDF: {str(e)}")
 
 
-@router.post("/statements/{statement_id}/quick-save")
+@router.post("/statements/{statement_id}/quick-save", response_model=None, responses={200: {"model": BalanceSaveResponse}})
 async def quick_save_statement(
     statement_id: int,
     request: QuickSaveRequest,
@@ -1182,75 +1272,70 @@ async def quick_save_statement(
     """
     Quick save statement using extracted data without review
     """
-    try:
-        # Get statement upload record
-        statement = portfolio_repo.get_statement_upload(statement_id)
-        if not statement:
-            raise HTTPException(status_code=404, detail="Statement not found")
-        
-        if not statement.account_id or not statement.extracted_balance or not statement.statement_date:
-            raise HTTPException(status_code=400, detail="Insufficient extracted data for quick save")
-        
-        # Check for duplicates again
-        duplicate_detector = MonthlyDuplicateDetector()
+    # Get statement upload record
+    statement = portfolio_repo.get_statement_upload(statement_id)
+    if not statement:
+        raise HTTPException(status_code=404, detail="Statement not found")
+    
+    if not statement.account_id or not statement.extracted_balance or not statement.statement_date:
+        raise HTTPException(status_code=400, detail="Insufficient extracted data for quick save")
+    
+    # Check for duplicates again, unless the upload's check still holds
+    duplicate_result = cached_duplicate_check(
+        statement_id,
+        portfolio_repo.balance_version,
+        (statement.account_id, statement.statement_date)
+    )
+    if duplicate_result is None:
         duplicate_result = duplicate_detector.check_monthly_duplicates(
             statement.account_id,
             statement.statement_date,
-            Decimal(str(statement.extracted_balance))
-        )
-        
-        # Handle duplicates based on user confirmation
-        if duplicate_result.is_duplicate and not request.confirm_duplicates:
-            if duplicate_result.recommendation == 'block_save':
-                raise HTTPException(
-                    status_code=409, 
-                    detail="Duplicate balance detected. Cannot save identical balance."
-                )
-            else:
-                # Return conflict for user confirmation
-                return {
-                    "success": False,
-                    "requires_confirmation": True,
-                    "duplicate_info": duplicate_result.__dict__,
-                    "message": duplicate_result.message
-                }
-        
-        # Create portfolio balance
-        new_balance = PortfolioBalance(
-            account_id=statement.account_id,
-            balance_date=statement.statement_date,
-            balance_amount=Decimal(str(statement.extracted_balance)),
-            data_source=DataSource.PDF_STATEMENT,
-            confidence_score=Decimal(str(statement.confidence_score)),
-            notes=f"Quick save from PDF: {statement.original_filename}"
+            _to_decimal(statement.extracted_balance)
         )
-        
-        # Save balance
-        saved_balance = portfolio_repo.save_balance(new_balance)
-        
-        # Update statement as processed
-        portfolio_repo.mark_statement_processed(statement_id)
-        
-        return {
-            "success": True,
-            "balance": {
-                "id": saved_balance.id,
-                "account_id": saved_balance.account_id,
-                "balance_date": saved_balance.balance_date.isoformat(),
-                "balance_amount": float(saved_balance.balance_amount),
-                "data_source": saved_balance.data_source.value,
-                "confidence_score": float(saved_balance.confidence_score)
-            },
-            "message": "Balance saved successfully via quick save"
-        }
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error in quick save: {str(e)}")
-
+    
+    # Handle duplicates based on user confirmation
+    if duplicate_result.is_duplicate and not request.confirm_duplicates:
+        if duplicate_result.recommendation == 'block_save':
+            raise HTTPException(
+                status_code=409, 
+                detail="Duplicate balance detected. Cannot save identical balance."
+            )
+        else:
+            # Return conflict for user confirmation
+            return ORJSONResponse(content={
+                "success": False,
+                "requires_confirmation": True,
+                "duplicate_info": duplicate_result.to_response_dict(),
+                "message": duplicate_result.message
+            })
+    
+    # Create portfolio balance
+    new_balance = PortfolioBalance(
+        account_id=statement.account_id,
+        balance_date=statement.statement_date,
+        balance_amount=_to_decimal(statement.extracted_balance),
+        data_source=DataSource.PDF_STATEMENT,
+        confidence_score=_to_decimal(statement.confidence_score),
+        notes=f"Quick save from PDF: {statement.original_filename}"
+    )
+    
+    # Save balance and mark the statement processed in one transaction
+    saved_balance = portfolio_repo.save_statement_balance(new_balance, statement_id)
+    
+    return ORJSONResponse(content={
+        "success": True,
+        "balance": {
+            "id": saved_balance.id,
+            "account_id": saved_balance.account_id,
+            "balance_date": saved_balance.balance_date,
+            "balance_amount": float(saved_balance.balance_amount),
+            "data_source": saved_balance.data_source.value,
+            "confidence_score": float(saved_balance.confidence_score)
+        },
+        "message": "Balance saved successfully via quick save"
+    })
 
-@router.post("/statements/{statement_id}/review")
+@router.post("/statements/{statement_id}/review", response_model=None, responses={200: {"model": BalanceSaveResponse}})
 async def save_reviewed_statement(
     statement_id: int,
     review_data: StatementReviewRequest,
@@ -1259,64 +1344,54 @@ async def save_reviewed_statement(
     """
     Save statement after user review and potential edits
     """
-    try:
-        # Get statement upload record
-        statement = portfolio_repo.get_statement_upload(statement_id)
-        if not statement:
-            raise HTTPException(status_code=404, detail="Statement not found")
-        
-        # Validate account exists
-        account = portfolio_repo.get_account_by_id(review_data.account_id)
-        if not account:
-            raise HTTPException(status_code=404, detail=f"Account {review_data.account_id} not found")
-        
-        # Parse date
-        balance_date = datetime.strptime(review_data.balance_date, '%Y-%m-%d').date()
-        
-        # Check for duplicates with the reviewed data
-        duplicate_detector = MonthlyDuplicateDetector()
-        duplicate_result = duplicate_detector.check_monthly_duplicates(
-            review_data.account_id,
-            balance_date,
-            Decimal(str(review_data.balance_amount))
-        )
-        
-        # Create balance entry
-        new_balance = PortfolioBalance(
-            account_id=review_data.account_id,
-            balance_date=balance_date,
-            balance_amount=Decimal(str(review_data.balance_amount)),
-            data_source=DataSource.PDF_STATEMENT,
-            confidence_score=Decimal(str(statement.confidence_score)),
-            notes=f"Reviewed PDF: {statement.original_filename}" + (f" | {review_data.notes}" if review_data.notes else "")
-        )
-        
-        # Save balance (repository handles duplicates)
-        saved_balance = portfolio_repo.save_balance(new_balance)
-        
-        # Mark statement as reviewed and processed
-        portfolio_repo.mark_statement_reviewed(statement_id, reviewed_by_user=True)
-        
-        return {
-            "success": True,
-            "balance": {
-                "id": saved_balance.id,
-                "account_id": saved_balance.account_id,
-                "balance_date": saved_balance.balance_date.isoformat(),
-                "balance_amount": float(saved_balance.balance_amount),
-                "data_source": saved_balance.data_source.value,
-                "confidence_score": float(saved_balance.confidence_score),
-                "account_name": account.account_name
-            },
-            "duplicate_info": duplicate_result.__dict__ if duplicate_result and duplicate_result.is_duplicate else None,
-            "message": f"Successfully saved reviewed balance for {account.account_name}"
-        }
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error saving reviewed statement: {str(e)}")
+    # Get statement upload record
+    statement = portfolio_repo.get_statement_upload(statement_id)
+    if not statement:
+        raise HTTPException(status_code=404, detail="Statement not found")
+    
+    # Validate account exists
+    account = portfolio_repo.get_account_by_id(review_data.account_id)
+    if not account:
+        raise HTTPException(status_code=404, detail=f"Account {review_data.account_id} not found")
+    
+    # Parse date
+    balance_date = parse_balance_date(review_data.balance_date)
+    
+    # Check for duplicates with the reviewed data
+    duplicate_result = duplicate_detector.check_monthly_duplicates(
+        review_data.account_id,
+        balance_date,
+        _to_decimal(review_data.balance_amount)
+    )
+    
+    # Create balance entry
+    new_balance = PortfolioBalance(
+        account_id=review_data.account_id,
+        balance_date=balance_date,
+        balance_amount=_to_decimal(review_data.balance_amount),
+        data_source=DataSource.PDF_STATEMENT,
+        confidence_score=_to_decimal(statement.confidence_score),
+        notes=f"Reviewed PDF: {statement.original_filename}{' | ' + review_data.notes if review_data.notes else ''}"
+    )
+    
+    # Save balance and mark statement as reviewed and processed in one transaction
+    saved_balance = portfolio_repo.save_statement_balance(new_balance, statement_id, reviewed_by_user=True)
     
+    return ORJSONResponse(content={
+        "success": True,
+        "balance": {
+            "id": saved_balance.id,
+            "account_id": saved_balance.account_id,
+            "balance_date": saved_balance.balance_date,
+            "balance_amount": float(saved_balance.balance_amount),
+            "data_source": saved_balance.data_source.value,
+            "confidence_score": float(saved_balance.confidence_score),
+            "account_name": account.account_name
+        },
+        "duplicate_info": duplicate_result.to_response_dict() if duplicate_result and duplicate_result.is_duplicate else None,
+        "message": f"Successfully saved reviewed balance for {account.account_name}"
+    })
+
 @router.post("/statements/{statement_id}/resolve-conflict")
 async def resolve_statement_conflict(
     statement_id: int,
@@ -1327,46 +1402,41 @@ async def resolve_statement_conflict(
     """
     Handle conflict resolution for investment statement duplicates
     """
-    try:
-        statement = portfolio_repo.get_statement_upload(statement_id)
-        if not statement:
-            raise HTTPException(status_code=404, detail="Statement not found")
+    statement = portfolio_repo.get_statement_upload(statement_id)
+    if not statement:
+        raise HTTPException(status_code=404, detail="Statement not found")
+    
+    if action == 'skip':
+        # Mark as skipped
+        portfolio_repo.mark_statement_processed(statement_id, status='skipped')
+        return ORJSONResponse(content={"success": True, "action": "skipped", "message": "Statement upload skipped"})
+    
+    elif action == 'proceed':
+        # Save despite duplicates (if user confirmed)
+        if not statement.account_id or not statement.extracted_balance or not statement.statement_date:
+            raise HTTPException(status_code=400, detail="Insufficient data to proceed")
+        
+        # Create balance entry
+        new_balance = PortfolioBalance(
+            account_id=statement.account_id,
+            balance_date=statement.statement_date,
+            balance_amount=_to_decimal(statement.extracted_balance),
+            data_source=DataSource.PDF_STATEMENT,
+            confidence_score=_to_decimal(statement.confidence_score),
+            notes=f"Saved despite duplicates: {statement.original_filename}"
+        )
         
-        if action == 'skip':
-            # Mark as skipped
-            portfolio_repo.mark_statement_processed(statement_id, status='skipped')
-            return {"success": True, "action": "skipped", "message": "Statement upload skipped"}
+        saved_balance = portfolio_repo.save_statement_balance(new_balance, statement_id)
         
-        elif action == 'proceed':
-            # Save despite duplicates (if user confirmed)
-            if not statement.account_id or not statement.extracted_balance or not statement.statement_date:
-                raise HTTPException(status_code=400, detail="Insufficient data to proceed")
-            
-            # Create balance entry
-            new_balance = PortfolioBalance(
-                account_id=statement.account_id,
-                balance_date=statement.statement_date,
-                balance_amount=Decimal(str(statement.extracted_balance)),
-                data_source=DataSource.PDF_STATEMENT,
-                confidence_score=Decimal(str(statement.confidence_score)),
-                notes=f"Saved despite duplicates: {statement.original_filename}"
-            )
-            
-            saved_balance = portfolio_repo.save_balance(new_balance)
-            portfolio_repo.mark_statement_processed(statement_id, status='saved')
-            
-            return {
-                "success": True, 
-                "action": "proceeded",
-                "balance": {
-                    "id": saved_balance.id,
-                    "balance_amount": float(saved_balance.balance_amount),
-                    "balance_date": saved_balance.balance_date.isoformat()
-                }
+        return ORJSONResponse(content={
+            "success": True, 
+            "action": "proceeded",
+            "balance": {
+                "id": saved_balance.id,
+                "balance_amount": float(saved_balance.balance_amount),
+                "balance_date": saved_balance.balance_date
             }
-        
-        else:
-            raise HTTPException(status_code=400, detail=f"Unknown action: {action}")
-            
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error resolving conflict: {str(e)}")
\ No newline at end of file
+        })
+    
+    else:
+        raise HTTPException(status_code=400, detail=f"Unknown action: {action}")
@@ -1,7 +1,5 @@
 # src/api/routers/transactions.py
 
-import os
-import tempfile
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Query
 from typing import List, Optional, Dict
 from datetime import date as date_type, datetime, timedelta
@@ -360,20 +358,9 @@ async def preview_upload(
                 original_filename += '.csv'
                 
             
-            # Create a temporary file with proper extension
-            file_extension = os.path.splitext(original_filename)[1] or '.csv'
-            
-            with tempfile.NamedTemporaryFile(delete=False, suffix=file_extension) as temp_file:
-                try:
-                    content = await file.read()
-                    temp_file.write(content)
-                    temp_file_path = temp_file.name
-                except Exception as e:
-                    continue
-            
             try:
-                # Process the file with the original filename for bank detection
-                df = import_service.process_bank_file(temp_file_path, original_filename=original_filename)
+                # Parse straight from the upload's spooled file instead of copying it to a temp file
+                df = import_service.process_bank_file(file.file, original_filename=original_filename)
                 
                 if df is not None and not df.empty:
                     # Create preview transactions with batch info for duplicate detection
@@ -472,12 +459,6 @@ async def preview_upload(
                 import traceback
                 traceback.print_exc()
                 continue
-            finally:
-                # Clean up the temporary file
-                try:
-                    os.unlink(temp_file_path)
-                except Exception as e:
-                    print(f"ERROR cleaning up temp file: {e}")
         
         # Store session data
         upload_sessions[session_id] = {
@@ -673,16 +654,9 @@ async def upload_file(
     Upload and process a single transaction file (legacy endpoint)
     """
     try:
-        # Create a temporary file to store the upload
-        with tempfile.NamedTemporaryFile(delete=False, suffix=os.path.splitext(file.filename)[1]) as temp_file:
-            # Write the uploaded file content
-            content = await file.read()
-            temp_file.write(content)
-            temp_file_path = temp_file.name
-        
         try:
-            # Process the file with original filename
-            df = import_service.process_bank_file(temp_file_path, original_filename=file.filename)
+            # Process the upload's spooled file directly with original filename
+            df = import_service.process_bank_file(file.file, original_filename=file.filename)
             
             if df is None or df.empty:
                 response_data = FileUploadResponse(
@@ -710,8 +684,7 @@ async def upload_file(
                 meta={"filename": file.filename, "content_type": file.content_type}
             )
         finally:
-            # Clean up the temporary file
-            os.unlink(temp_file_path)
+            await file.close()
     except Exception as e:
         raise APIError(status_code=500, detail=str(e))
 
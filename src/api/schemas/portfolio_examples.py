@@ -0,0 +1,63 @@
+# src/api/schemas/portfolio_examples.py
+"""
+OpenAPI examples for the portfolio response models.
+Imported lazily by the models' json_schema_extra hooks, i.e. only when the schema is built.
+"""
+
+PORTFOLIO_EXAMPLES = {
+    "account_performance": {
+        "account_id": 1,
+        "account_name": "401(k) Plan",
+        "institution": "ADP",
+        "account_type": "401k",
+        "start_balance": 200.01,
+        "end_balance": 15000.00,
+        "net_deposits": 12000.00,
+        "actual_growth": 2800.00,
+        "growth_percentage": 23.33,
+        "annualized_return": 8.5,
+        "period_months": 48
+    },
+    "portfolio_overview": {
+        "total_portfolio_value": 95000.00,
+        "total_deposits": 80000.00,
+        "total_growth": 15000.00,
+        "growth_percentage": 18.75,
+        "accounts": [],
+        "by_institution": [],
+        "by_account_type": [],
+        "as_of_date": "2024-06-06"
+    },
+    "portfolio_trends": {
+        "monthly_values": [
+            {
+                "date": "2024-01-01",
+                "month_display": "Jan 2024",
+                "total_value": 90000.00,
+                "wealthfront_investment": 25000.00,
+                "schwab_brokerage": 30000.00
+            }
+        ],
+        "growth_attribution": {},
+        "best_month": {
+            "month_display": "May 2024",
+            "total_value": 95000.00
+        },
+        "worst_month": {
+            "month_display": "Jan 2024", 
+            "total_value": 85000.00
+        }
+    },
+    "account_list": {
+        "accounts": [
+            {
+                "id": 1,
+                "account_name": "Wealthfront Investment",
+                "institution": "Wealthfront",
+                "account_type": "brokerage",
+                "is_active": True
+            }
+        ],
+        "total_accounts": 7
+    }
+}
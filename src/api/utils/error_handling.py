@@ -43,4 +43,56 @@ async def api_error_handler(request: Request, exc: APIError) -> JSONResponse:
                 **(exc.extra if exc.extra else {})
             }
         }
-    )
\ No newline at end of file
+    )
+
+async def unhandled_error_handler(request: Request, exc: Exception) -> JSONResponse:
+    """Handler for exceptions no route caught - logs the traceback and returns a generic 500"""
+    logger.exception(
+        f"Unhandled error on {request.method} {request.url.path}: {str(exc)}",
+        extra={
+            "path": request.url.path,
+            "method": request.method
+        }
+    )
+    
+    return JSONResponse(
+        status_code=500,
+        content={
+            "error": {
+                "code": "ERROR_500",
+                "message": "Internal server error",
+                "status": 500
+            }
+        }
+    )
+
+class UnhandledErrorMiddleware:
+    """
+    Plain ASGI middleware that turns exceptions no route caught into the generic 500 from
+    unhandled_error_handler. Add it before CORSMiddleware so the error response passes
+    back through CORS and keeps its headers.
+    """
+    def __init__(self, app):
+        self.app = app
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        response_started = False
+        
+        async def send_wrapper(message):
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+        
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except Exception as exc:
+            # Once headers are out a different response can't be sent; let the server close it
+            if response_started:
+                raise
+            response = await unhandled_error_handler(Request(scope), exc)
+            await response(scope, receive, send)
@@ -1,6 +1,9 @@
 # src/api/utils/response.py
 
 from typing import Generic, TypeVar, Dict, Any, Optional
+from decimal import Decimal
+import orjson
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel, Field
 
 T = TypeVar('T')
@@ -18,4 +21,25 @@ class ApiResponse(BaseModel, Generic[T]):
             data=data,
             message=message,
             meta=meta or {}
-        )
\ No newline at end of file
+        )
+
+
+def orjson_default(value: Any) -> Any:
+    """orjson fallback for types it doesn't handle natively (Decimal amounts become floats)"""
+    if isinstance(value, Decimal):
+        return float(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def dumps_json(content: Any) -> bytes:
+    """Serialize content with orjson, encoding Decimal values as floats"""
+    return orjson.dumps(content, default=orjson_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+class DecimalORJSONResponse(ORJSONResponse):
+    """
+    ORJSONResponse that also encodes Decimal values, so service-layer dataclasses
+    (Decimal amounts, dates, enums) can be returned without converting each field
+    """
+    def render(self, content: Any) -> bytes:
+        return dumps_json(content)
@@ -5,10 +5,11 @@ SECURITY UPDATE STEP 2: Removed raw_extracted_text field to protect sensitive OC
 """
 
 from dataclasses import dataclass, field
-from datetime import date
+from datetime import date, timedelta
 from decimal import Decimal
 from typing import Optional, Dict, List
 from enum import Enum
+from functools import lru_cache
 
 
 class AccountType(Enum):
@@ -26,6 +27,63 @@ class DataSource(Enum):
     PDF_STATEMENT = "pdf_statement"
 
 
+class Period(str, Enum):
+    """Lookback periods accepted by the performance, trends and history endpoints"""
+    SIX_MONTHS = "6m"
+    ONE_YEAR = "1y"
+    TWO_YEARS = "2y"
+    FIVE_YEARS = "5y"
+    ALL = "all"
+
+
+# Lookback length in months for each period ("all" starts at PERIOD_ALL_START instead)
+PERIOD_MONTHS = {
+    Period.SIX_MONTHS: 6,
+    Period.ONE_YEAR: 12,
+    Period.TWO_YEARS: 24,
+    Period.FIVE_YEARS: 60,
+}
+PERIOD_ALL_START = date(2020, 1, 1)
+
+
+@lru_cache(maxsize=64)
+def period_start_date(end_date: date, period: str) -> date:
+    """Start date of a period ending at end_date (cached, as callers pass today's date)"""
+    months = PERIOD_MONTHS.get(period)
+    if months is None:
+        return PERIOD_ALL_START
+    
+    month_index = end_date.year * 12 + end_date.month - 1 - months
+    year, month = divmod(month_index, 12)
+    
+    # Days past the end of the target month (e.g. Feb 29 in a non-leap year) clamp to its last day
+    try:
+        return end_date.replace(year=year, month=month + 1)
+    except ValueError:
+        return end_date.replace(year=year, month=month + 2, day=1) - timedelta(days=1)
+
+
+@dataclass
+class AccountCard:
+    """Lightweight account listing row (plain column values, no enum mapping)"""
+    id: int
+    account_name: str
+    institution: str
+    account_type: str
+    is_active: bool
+
+
+@dataclass(frozen=True)
+class AccountMatchIndex:
+    """
+    Accounts laid out as parallel tuples for statement matching, with the
+    names and institutions lowercased once when the index is built
+    """
+    accounts: tuple
+    names_lower: tuple
+    institutions_lower: tuple
+
+
 @dataclass
 class InvestmentAccount:
     """Represents an investment account"""
@@ -118,7 +176,7 @@ class InstitutionSummary:
 @dataclass
 class AccountTypeSummary:
     """Summary of accounts by type"""
-    account_type: str
+    account_type: AccountType
     total_balance: Decimal
     total_growth: Decimal
     growth_percentage: Decimal
@@ -9,7 +9,7 @@ from datetime import datetime
 from sqlalchemy import text
 
 from src.models.models import MonthlySummary, Category
-from database import get_db_session
+from database import get_db_session, to_cents, from_cents
 from src.utils.date_utils import parse_month_period
 
 SortDirection = Literal["asc", "desc"]
@@ -39,20 +39,20 @@ class MonthlySummaryRepository:
                 'month': summary.month,
                 'year': summary.year,
                 'month_year': summary.month_year,
-                'investment_total': float(summary.investment_total),
-                'total': float(summary.total),
-                'total_minus_invest': float(summary.total_minus_invest),
-                'investment_deposits': float(summary.investment_deposits),
-                'investment_withdrawals': float(summary.investment_withdrawals),
-                'income': float(summary.income),
-                'net_income': float(summary.net_income),
-                'net_overall': float(summary.net_overall),
-                'net_without_investments': float(summary.net_without_investments)
+                'investment_total': to_cents(summary.investment_total),
+                'total': to_cents(summary.total),
+                'total_minus_invest': to_cents(summary.total_minus_invest),
+                'investment_deposits': to_cents(summary.investment_deposits),
+                'investment_withdrawals': to_cents(summary.investment_withdrawals),
+                'income': to_cents(summary.income),
+                'net_income': to_cents(summary.net_income),
+                'net_overall': to_cents(summary.net_overall),
+                'net_without_investments': to_cents(summary.net_without_investments)
             }
             
-            # Add category totals
+            # Add category totals (stored as integer cents)
             for category, amount in summary.category_totals.items():
-                update_data[category] = float(amount)
+                update_data[category] = to_cents(amount)
             
             if existing:
                 # UPDATE existing record
@@ -266,11 +266,11 @@ class MonthlySummaryRepository:
 
         for key in row._mapping.keys():
             if key not in standard_columns and row._mapping[key] is not None:
-                category_totals[key] = Decimal(str(row._mapping[key]))
+                category_totals[key] = Decimal(str(from_cents(row._mapping[key])))
 
-        # Helper function to safely convert to Decimal
+        # Helper function to safely convert stored cents to Decimal dollars
         def to_decimal(value):
-            return Decimal(str(value)) if value is not None else Decimal('0')
+            return Decimal(str(from_cents(value))) if value is not None else Decimal('0')
 
         return MonthlySummary(
             id=row.id,
@@ -313,6 +313,19 @@ class MonthlySummaryRepository:
             months_processed = 0
             months_updated = 0
             
+            # Fetch every (month, category) total for the affected months in one grouped query
+            month_params = {f"month_{i}": month for i, month in enumerate(affected_months)}
+            totals_query = text(f"""
+            SELECT month, category, SUM(amount) as total
+            FROM transactions
+            WHERE month IN ({', '.join(f':{key}' for key in month_params)})
+            GROUP BY month, category
+            """)
+            month_category_totals = {
+                (row.month, row.category): row.total
+                for row in session.execute(totals_query, month_params).fetchall()
+            }
+            
             # Process each affected month
             for month_period, affected_categories in affected_months.items():
                 try:
@@ -345,16 +358,9 @@ class MonthlySummaryRepository:
                 
                 # For each affected category, get new totals from transactions table
                 for category in sorted(affected_categories):
-                    query = text("""
-                    SELECT SUM(amount) as total
-                    FROM transactions
-                    WHERE month = :month AND category = :category
-                    GROUP BY category
-                    """)
-                    
-                    result = session.execute(query, {"month": month_period, "category": category}).fetchone()
-                    if result and result[0] is not None:
-                        category_total = result[0]
+                    result = month_category_totals.get((month_period, category))
+                    if result is not None:
+                        category_total = from_cents(result)
                         
                         # Ensure Pay and Payment are positive in the monthly summary
                         if category in ['Pay', 'Payment']:
@@ -7,21 +7,39 @@ SECURITY UPDATE STEP 2: Removed raw_extracted_text handling to protect sensitive
 from typing import List, Dict, Set, Tuple, Optional
 from datetime import date, datetime
 from decimal import Decimal
-from sqlalchemy import text
+import threading
+import time
+from sqlalchemy import and_, text
 
 from src.models.portfolio_models import (
-    InvestmentAccount, PortfolioBalance, StatementUpload, 
+    InvestmentAccount, AccountCard, AccountMatchIndex, PortfolioBalance, StatementUpload, 
     AccountType, DataSource
 )
 from database import (
     get_db_session, InvestmentAccountModel, 
-    PortfolioBalanceModel, StatementUploadModel
+    PortfolioBalanceModel, StatementUploadModel,
+    upsert_portfolio_balances, upsert_portfolio_balance
 )
 
 
 class PortfolioRepository:
     """Repository for portfolio database operations"""
     
+    # The account list rarely changes, so get_all_accounts results are reused for this many seconds
+    ACCOUNTS_CACHE_TTL = 300
+    
+    def __init__(self):
+        # Bumped on every balance write so cached portfolio aggregates can tell they are stale
+        self.balance_version = 0
+        # (kind, active_only) -> (cached_at, value); shared by request threads, hence the lock
+        self._accounts_cache: Dict[Tuple[str, bool], Tuple[float, object]] = {}
+        self._accounts_cache_lock = threading.Lock()
+    
+    def invalidate_accounts_cache(self):
+        """Drop cached account lists; call after any write to investment_accounts"""
+        with self._accounts_cache_lock:
+            self._accounts_cache.clear()
+    
     def get_account_by_name(self, account_name: str) -> Optional[InvestmentAccount]:
         """Find an investment account by name"""
         session = get_db_session()
@@ -39,35 +57,104 @@ class PortfolioRepository:
             session.close()
     
     def get_account_by_id(self, account_id: int) -> Optional[InvestmentAccount]:
-        """Find an investment account by ID"""
+        """Find an investment account by ID (served from a cached ID index for ACCOUNTS_CACHE_TTL seconds)"""
+        def load(session):
+            # One query fills every ID, so the index stays bounded by the accounts table
+            return {
+                model.id: self._map_account_to_domain(model)
+                for model in session.query(InvestmentAccountModel).all()
+            }
+        
+        return self._cached(('by_id', False), load).get(account_id)
+    
+    def get_accounts_by_ids(self, account_ids: List[int]) -> Dict[int, InvestmentAccount]:
+        """Find several investment accounts by ID in one query, keyed by ID"""
+        if not account_ids:
+            return {}
+        
         session = get_db_session()
         
         try:
-            account_model = session.query(InvestmentAccountModel).filter(
-                InvestmentAccountModel.id == account_id
-            ).first()
-            
-            if not account_model:
-                return None
+            account_models = session.query(InvestmentAccountModel).filter(
+                InvestmentAccountModel.id.in_(set(account_ids))
+            ).all()
             
-            return self._map_account_to_domain(account_model)
+            return {model.id: self._map_account_to_domain(model) for model in account_models}
         finally:
             session.close()
     
     def get_all_accounts(self, active_only: bool = True) -> List[InvestmentAccount]:
-        """Get all investment accounts"""
-        session = get_db_session()
-        
-        try:
+        """Get all investment accounts (cached for ACCOUNTS_CACHE_TTL seconds)"""
+        def load(session):
             query = session.query(InvestmentAccountModel)
             if active_only:
                 query = query.filter(InvestmentAccountModel.is_active == True)
             
-            account_models = query.all()
+            return [self._map_account_to_domain(model) for model in query.all()]
+        
+        return self._cached_accounts(('accounts', active_only), load)
+    
+    def get_all_accounts_cards(self, active_only: bool = True) -> List[AccountCard]:
+        """
+        Get the account listing columns only (cached for ACCOUNTS_CACHE_TTL seconds)
+        
+        Selects just the five listed columns as plain rows, skipping ORM entity
+        materialization and the AccountType enum mapping.
+        """
+        def load(session):
+            query = session.query(
+                InvestmentAccountModel.id,
+                InvestmentAccountModel.account_name,
+                InvestmentAccountModel.institution,
+                InvestmentAccountModel.account_type,
+                InvestmentAccountModel.is_active
+            )
+            if active_only:
+                query = query.filter(InvestmentAccountModel.is_active == True)
+            
+            return [AccountCard(*row) for row in query.all()]
+        
+        return self._cached_accounts(('cards', active_only), load)
+    
+    def get_account_match_index(self, active_only: bool = True) -> AccountMatchIndex:
+        """Get the accounts as a lowercased matching index (cached for ACCOUNTS_CACHE_TTL seconds)"""
+        def load(session):
+            query = session.query(InvestmentAccountModel)
+            if active_only:
+                query = query.filter(InvestmentAccountModel.is_active == True)
             
-            return [self._map_account_to_domain(model) for model in account_models]
+            accounts = tuple(self._map_account_to_domain(model) for model in query.all())
+            return AccountMatchIndex(
+                accounts=accounts,
+                names_lower=tuple(account.account_name.lower() for account in accounts),
+                institutions_lower=tuple(account.institution.lower() for account in accounts)
+            )
+        
+        # The index is immutable, so it is shared rather than copied
+        return self._cached(('match_index', active_only), load)
+    
+    def _cached_accounts(self, key: Tuple[str, bool], load) -> list:
+        """Return a copy of the cached account list for key, loading it with load(session) when stale"""
+        return list(self._cached(key, load))
+    
+    def _cached(self, key: Tuple[str, bool], load):
+        """Return the cached value for key, loading it with load(session) when stale"""
+        with self._accounts_cache_lock:
+            cached = self._accounts_cache.get(key)
+            if cached and time.monotonic() - cached[0] < self.ACCOUNTS_CACHE_TTL:
+                return cached[1]
+        
+        session = get_db_session()
+        
+        try:
+            value = load(session)
         finally:
             session.close()
+        
+        with self._accounts_cache_lock:
+            self._accounts_cache[key] = (time.monotonic(), value)
+        
+        return value
     
     def get_balances_for_account(
         self, 
@@ -100,17 +187,11 @@ class PortfolioRepository:
         
         try:
             # Convert to database model
-            balance_model = PortfolioBalanceModel(
-                account_id=balance.account_id,
-                balance_date=balance.balance_date,
-                balance_amount=float(balance.balance_amount),
-                data_source=balance.data_source.value,
-                confidence_score=float(balance.confidence_score),
-                notes=balance.notes
-            )
+            balance_model = self._map_balance_to_model(balance)
             
             session.add(balance_model)
             session.commit()
+            self.balance_version += 1
             
             # Update domain object with generated ID
             balance.id = balance_model.id
@@ -123,6 +204,187 @@ class PortfolioRepository:
             raise e
         finally:
             session.close()
+    
+    def save_statement_balance(
+        self, balance: PortfolioBalance, statement_id: int, reviewed_by_user: bool = False
+    ) -> PortfolioBalance:
+        """
+        Save a balance taken from a statement upload and mark the upload as saved
+        
+        Both writes share one transaction and commit, so a balance is never left
+        saved against a statement that still looks unprocessed (or the reverse).
+        """
+        session = get_db_session()
+        
+        try:
+            balance_model = self._map_balance_to_model(balance)
+            session.add(balance_model)
+            
+            statement_updates = {
+                StatementUploadModel.processing_status: 'saved',
+                StatementUploadModel.processed_timestamp: datetime.now()
+            }
+            if reviewed_by_user:
+                statement_updates[StatementUploadModel.reviewed_by_user] = True
+            
+            session.query(StatementUploadModel).filter(
+                StatementUploadModel.id == statement_id
+            ).update(statement_updates, synchronize_session=False)
+            
+            session.commit()
+            self.balance_version += 1
+            
+            balance.id = balance_model.id
+            balance.created_at = balance_model.created_at.date() if balance_model.created_at else None
+            
+            return balance
+            
+        except Exception as e:
+            session.rollback()
+            raise e
+        finally:
+            session.close()
+    
+    def get_account_and_balance(
+        self, account_id: int, balance_date: date
+    ) -> Tuple[Optional[InvestmentAccount], Optional[PortfolioBalance]]:
+        """
+        Get an account and its existing balance on a date (if any) in one LEFT JOIN query
+        
+        Returns:
+            (account, existing_balance), or (None, None) if the account doesn't exist
+        """
+        session = get_db_session()
+        
+        try:
+            row = session.query(InvestmentAccountModel, PortfolioBalanceModel).outerjoin(
+                PortfolioBalanceModel,
+                and_(
+                    PortfolioBalanceModel.account_id == InvestmentAccountModel.id,
+                    PortfolioBalanceModel.balance_date == balance_date
+                )
+            ).filter(InvestmentAccountModel.id == account_id).first()
+            
+            if not row:
+                return None, None
+            
+            account_model, balance_model = row
+            existing = self._map_balance_to_domain(balance_model) if balance_model else None
+            return self._map_account_to_domain(account_model), existing
+        finally:
+            session.close()
+    
+    def check_balance_exists(self, account_id: int, balance_date: date) -> Optional[PortfolioBalance]:
+        """Get the existing balance for an account on a date, if any"""
+        return self.check_balances_exist_bulk([(account_id, balance_date)]).get((account_id, balance_date))
+    
+    def check_balances_exist_bulk(
+        self, keys: List[Tuple[int, date]]
+    ) -> Dict[Tuple[int, date], PortfolioBalance]:
+        """
+        Look up existing balances for many (account_id, balance_date) pairs in one query
+        
+        Returns:
+            Dictionary mapping (account_id, balance_date) to the existing PortfolioBalance
+        """
+        if not keys:
+            return {}
+        
+        session = get_db_session()
+        
+        try:
+            return self._find_balances(session, keys)
+        finally:
+            session.close()
+    
+    def upsert_balance(self, balance: PortfolioBalance) -> Tuple[PortfolioBalance, bool]:
+        """
+        Save a portfolio balance, overwriting any existing balance for the same account
+        and date, in a single INSERT ... ON CONFLICT DO UPDATE ... RETURNING statement
+        
+        Returns:
+            The saved balance and whether an existing balance was updated
+        """
+        session = get_db_session()
+        
+        try:
+            created_at = datetime.utcnow()
+            balance_id, stored_created_at = upsert_portfolio_balance(session, {
+                'account_id': balance.account_id,
+                'balance_date': balance.balance_date,
+                'balance_month': balance.balance_date.strftime('%Y-%m'),
+                'balance_amount': float(balance.balance_amount),
+                'data_source': balance.data_source.value,
+                'confidence_score': float(balance.confidence_score),
+                'notes': balance.notes,
+                'created_at': created_at
+            })
+            session.commit()
+            self.balance_version += 1
+            
+            balance.id = balance_id
+            balance.created_at = stored_created_at.date() if stored_created_at else None
+            
+            return balance, stored_created_at != created_at
+            
+        except Exception as e:
+            session.rollback()
+            raise e
+        finally:
+            session.close()
+    
+    def save_balances(self, balances: List[PortfolioBalance]) -> List[PortfolioBalance]:
+        """
+        Save many portfolio balances in one transaction, overwriting any existing
+        balance for the same account and date
+        """
+        if not balances:
+            return []
+        
+        session = get_db_session()
+        
+        try:
+            upsert_portfolio_balances(session, [
+                {
+                    'account_id': balance.account_id,
+                    'balance_date': balance.balance_date,
+                    'balance_month': balance.balance_date.strftime('%Y-%m'),
+                    'balance_amount': float(balance.balance_amount),
+                    'data_source': balance.data_source.value,
+                    'confidence_score': float(balance.confidence_score),
+                    'notes': balance.notes
+                } for balance in balances
+            ])
+            
+            # Read back the stored rows for their IDs in the same transaction
+            saved = self._find_balances(session, [(b.account_id, b.balance_date) for b in balances])
+            session.commit()
+            self.balance_version += 1
+            
+            return [saved[(b.account_id, b.balance_date)] for b in balances]
+            
+        except Exception as e:
+            session.rollback()
+            raise e
+        finally:
+            session.close()
+    
+    def _find_balances(self, session, keys: List[Tuple[int, date]]) -> Dict[Tuple[int, date], PortfolioBalance]:
+        """Fetch balances matching (account_id, balance_date) pairs with a single SELECT"""
+        wanted = set(keys)
+        
+        # Filter on both IN lists, then keep only the exact pairs that were asked for
+        balance_models = session.query(PortfolioBalanceModel).filter(
+            PortfolioBalanceModel.account_id.in_({account_id for account_id, _ in wanted}),
+            PortfolioBalanceModel.balance_date.in_({balance_date for _, balance_date in wanted})
+        ).all()
+        
+        return {
+            (model.account_id, model.balance_date): self._map_balance_to_domain(model)
+            for model in balance_models
+            if (model.account_id, model.balance_date) in wanted
+        }
+    
     def get_latest_balances(self) -> Dict[int, PortfolioBalance]:
         """
         Get the latest balance for each account
@@ -164,6 +426,18 @@ class PortfolioRepository:
             created_at=model.created_at.date() if model.created_at else None
         )
     
+    def _map_balance_to_model(self, balance: PortfolioBalance) -> PortfolioBalanceModel:
+        """Map domain entity to a new database model"""
+        return PortfolioBalanceModel(
+            account_id=balance.account_id,
+            balance_date=balance.balance_date,
+            balance_month=balance.balance_date.strftime('%Y-%m'),
+            balance_amount=float(balance.balance_amount),
+            data_source=balance.data_source.value,
+            confidence_score=float(balance.confidence_score),
+            notes=balance.notes
+        )
+    
     def _map_balance_to_domain(self, model: PortfolioBalanceModel) -> PortfolioBalance:
         """Map database model to domain entity"""
         return PortfolioBalance(
@@ -188,6 +462,7 @@ class PortfolioRepository:
             statement_model = StatementUploadModel(
                 account_id=statement.account_id,
                 statement_date=statement.statement_date,
+                statement_month=statement.statement_date.strftime('%Y-%m') if statement.statement_date else None,
                 original_filename=statement.original_filename,
                 file_path=statement.file_path,
                 relevant_page_number=statement.relevant_page_number,
@@ -273,4 +548,23 @@ class PortfolioRepository:
             session.rollback()
             raise e
         finally:
-            session.close()
\ No newline at end of file
+            session.close()
+    
+    def mark_statement_processed(self, statement_id: int, status: str = 'saved'):
+        """Set a statement's processing status (e.g. 'saved', 'skipped') with a single UPDATE"""
+        session = get_db_session()
+        
+        try:
+            session.query(StatementUploadModel).filter(
+                StatementUploadModel.id == statement_id
+            ).update({
+                StatementUploadModel.processing_status: status,
+                StatementUploadModel.processed_timestamp: datetime.now()
+            }, synchronize_session=False)
+            session.commit()
+            
+        except Exception as e:
+            session.rollback()
+            raise e
+        finally:
+            session.close()
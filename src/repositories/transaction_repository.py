@@ -8,12 +8,21 @@ from sqlalchemy.exc import IntegrityError
 from sqlalchemy import text
 
 from src.models.models import Transaction
-from database import get_db_session, TransactionModel
+from database import (
+    get_db_session, TransactionModel, to_cents, from_cents, insert_transaction,
+    hash_to_blob, blob_to_hash
+)
 
 
 class TransactionRepository:
     """Repository for transaction database operations"""
     
+    def __init__(self):
+        # Bumped on every transaction write so cached aggregates built from transactions
+        # (portfolio deposits and growth) can tell they are stale. The counter lives in
+        # this process only, so it cannot invalidate caches held by other workers.
+        self.write_version = 0
+    
     def _create_transaction_from_row(self, row):
         """
         Helper method to create Transaction domain entity from database row.
@@ -38,16 +47,16 @@ class TransactionRepository:
             id=row.id,
             date=tx_date,
             description=row.description,
-            amount=Decimal(str(row.amount)),
+            amount=Decimal(str(from_cents(row.amount))),
             category=row.category,
             source=row.source,
-            transaction_hash=row.transaction_hash,
+            transaction_hash=blob_to_hash(row.transaction_hash),
             month_str=row.month,
             # UPDATED FIELDS
             import_timestamp=import_timestamp,  # CHANGED from import_date
             rank_within_batch=getattr(row, 'rank_within_batch', None),
             import_batch_id=getattr(row, 'import_batch_id', None),
-            base_hash=getattr(row, 'base_hash', None)
+            base_hash=blob_to_hash(getattr(row, 'base_hash', None))
         )
     
     def find_with_filters(
@@ -110,8 +119,8 @@ class TransactionRepository:
             aggregate_query = text(f"""
             SELECT 
                 COUNT(*) as total_count,
-                COALESCE(SUM(amount), 0) as total_sum,
-                COALESCE(AVG(amount), 0) as avg_amount
+                COALESCE(SUM(amount), 0) / 100.0 as total_sum,
+                COALESCE(AVG(amount), 0) / 100.0 as avg_amount
             FROM transactions
             {where_sql}
             """)
@@ -192,6 +201,7 @@ class TransactionRepository:
             
             transaction.id = transaction_model.id
             session.commit()
+            self.write_version += 1
             
             return transaction
             
@@ -224,28 +234,29 @@ class TransactionRepository:
                 is_dup = self.is_duplicate(transaction)
                 
                 if not is_dup:
-                    # Not a duplicate - save it
-                    transaction_model = TransactionModel(
-                        date=transaction.date,
-                        description=transaction.description,
-                        amount=float(transaction.amount),
-                        category=transaction.category,
-                        source=transaction.source,
-                        month=transaction.month_str,
-                        transaction_hash=transaction.transaction_hash,
-                        import_timestamp=transaction.import_timestamp,
-                        rank_within_batch=transaction.rank_within_batch,
-                        import_batch_id=transaction.import_batch_id,
-                        base_hash=transaction.base_hash
-                    )
+                    # Not a duplicate - save it through the precompiled insert statement
+                    transaction_row = {
+                        'date': transaction.date,
+                        'description': transaction.description,
+                        'amount': float(transaction.amount),
+                        'category': transaction.category,
+                        'source': transaction.source,
+                        'month': transaction.month_str,
+                        'transaction_hash': transaction.transaction_hash,
+                        'import_timestamp': transaction.import_timestamp,
+                        'rank_within_batch': transaction.rank_within_batch,
+                        'import_batch_id': transaction.import_batch_id,
+                        'base_hash': transaction.base_hash
+                    }
                     
                     try:
-                        session.add(transaction_model)
+                        new_id = insert_transaction(session, transaction_row)
                         session.commit()
+                        self.write_version += 1
                         records_added += 1
                         
                         # Update domain entity with generated ID
-                        transaction.id = transaction_model.id
+                        transaction.id = new_id
                         
                         # Track which month and category were affected
                         month = transaction.month_str
@@ -323,7 +334,7 @@ class TransactionRepository:
             """)
             
             duplicate_result = session.execute(duplicate_check_query, {
-                "hash": new_hash,
+                "hash": hash_to_blob(new_hash),
                 "current_id": transaction_id
             }).fetchone()
             
@@ -347,16 +358,17 @@ class TransactionRepository:
             session.execute(update_query, {
                 "date": new_date.isoformat(),
                 "description": updated_data['description'],
-                "amount": float(updated_data['amount']),
+                "amount": to_cents(updated_data['amount']),
                 "category": updated_data['category'],
                 "source": updated_data['source'],
                 "month_str": new_month_str,
-                "hash": new_hash,
-                "base_hash": new_base_hash,
+                "hash": hash_to_blob(new_hash),
+                "base_hash": hash_to_blob(new_base_hash),
                 "id": transaction_id
             })
             
             session.commit()
+            self.write_version += 1
             
             # Create updated domain entity
             updated_transaction = Transaction(
@@ -425,7 +437,7 @@ class TransactionRepository:
             result = session.execute(query).fetchall()
             
             # Extract hash values
-            return [row[0] for row in result]
+            return [blob_to_hash(row[0]) for row in result]
         finally:
             session.close()
     
@@ -443,7 +455,7 @@ class TransactionRepository:
             """)
             
             result = session.execute(query, {
-                "base_hash": base_hash,
+                "base_hash": hash_to_blob(base_hash),
                 "rank": rank
             }).fetchone()
             
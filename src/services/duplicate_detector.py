@@ -3,7 +3,7 @@
 from typing import Dict, Optional, List
 from datetime import date
 from decimal import Decimal
-from sqlalchemy import extract, and_
+from sqlalchemy import and_
 from dataclasses import dataclass
 
 from database import get_db_session, PortfolioBalanceModel, BankBalanceModel
@@ -18,6 +18,22 @@ class DuplicateCheckResult:
     existing_balance: Optional[Dict] = None
     similarity_percentage: float = 0.0
     recommendation: str = ""
+    
+    def to_response_dict(self) -> Dict:
+        """
+        JSON-ready copy of the result for API responses
+        
+        existing_balance is built from primitives (floats, ISO date strings) by the
+        detector, so the encoder has nothing left to convert.
+        """
+        return {
+            "is_duplicate": self.is_duplicate,
+            "conflict_type": self.conflict_type,
+            "message": self.message,
+            "existing_balance": self.existing_balance,
+            "similarity_percentage": self.similarity_percentage,
+            "recommendation": self.recommendation
+        }
 
 
 class MonthlyDuplicateDetector:
@@ -53,8 +69,7 @@ class MonthlyDuplicateDetector:
             query = session.query(PortfolioBalanceModel).filter(
                 and_(
                     PortfolioBalanceModel.account_id == account_id,
-                    extract('year', PortfolioBalanceModel.balance_date) == balance_date.year,
-                    extract('month', PortfolioBalanceModel.balance_date) == balance_date.month
+                    PortfolioBalanceModel.balance_month == balance_date.strftime('%Y-%m')
                 )
             )
             
@@ -356,6 +371,10 @@ class MonthlyDuplicateDetector:
             session.close()
 
 
+# Shared instance for the convenience functions below (the detector only holds thresholds)
+_default_detector = MonthlyDuplicateDetector()
+
+
 def check_monthly_duplicates(account_id: int, balance_date: date, balance_amount: Decimal) -> DuplicateCheckResult:
     """
     Convenience function to check for monthly duplicates
@@ -368,8 +387,7 @@ def check_monthly_duplicates(account_id: int, balance_date: date, balance_amount
     Returns:
         DuplicateCheckResult with conflict information
     """
-    detector = MonthlyDuplicateDetector()
-    return detector.check_monthly_duplicates(account_id, balance_date, balance_amount)
+    return _default_detector.check_monthly_duplicates(account_id, balance_date, balance_amount)
 
 
 def check_filename_duplicates(filename: str) -> DuplicateCheckResult:
@@ -382,8 +400,7 @@ def check_filename_duplicates(filename: str) -> DuplicateCheckResult:
     Returns:
         DuplicateCheckResult for filename conflicts
     """
-    detector = MonthlyDuplicateDetector()
-    return detector.check_filename_duplicates(filename)
+    return _default_detector.check_filename_duplicates(filename)
 
 def check_bank_monthly_duplicates(account_name: str, statement_month: str, ending_balance: Decimal, statement_date: date) -> DuplicateCheckResult:
     """
@@ -398,5 +415,4 @@ def check_bank_monthly_duplicates(account_name: str, statement_month: str, endin
     Returns:
         DuplicateCheckResult with conflict information
     """
-    detector = MonthlyDuplicateDetector()
-    return detector.check_bank_monthly_duplicates(account_name, statement_month, ending_balance, statement_date)
\ No newline at end of file
+    return _default_detector.check_bank_monthly_duplicates(account_name, statement_month, ending_balance, statement_date)
\ No newline at end of file
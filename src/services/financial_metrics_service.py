@@ -1,6 +1,6 @@
 # src/services/financial_metrics_service.py
 
-from typing import Dict, Optional, List
+from typing import Dict, Iterator, Optional, List
 from decimal import Decimal
 from datetime import date, datetime, timedelta
 from collections import defaultdict
@@ -8,6 +8,7 @@ from collections import defaultdict
 from src.repositories.bank_balance_repository import BankBalanceRepository
 from src.repositories.portfolio_repository import PortfolioRepository
 from src.repositories.monthly_summary_repository import MonthlySummaryRepository
+from src.models.portfolio_models import period_start_date
 
 
 class FinancialMetricsService:
@@ -73,24 +74,29 @@ class FinancialMetricsService:
             "runway_status": self._get_runway_status(float(runway_months))
         }
     
-    def calculate_net_worth(self) -> Dict:
+    def calculate_net_worth(self, runway_data: Optional[Dict] = None) -> Dict:
         """Calculate total net worth (liquid + investments)"""
         
-        # Get liquid assets
-        runway_data = self.calculate_financial_runway()
-        liquid_assets = runway_data["total_liquid_assets"]
+        # Get liquid assets (reusing runway data when the caller already has it)
+        if runway_data is None:
+            runway_data = self.calculate_financial_runway()
         
-        # Get investment assets (exclude Wealthfront Cash since it's liquid)
+        return self.combine_net_worth(runway_data["total_liquid_assets"], self.calculate_investment_assets())
+    
+    def calculate_investment_assets(self) -> float:
+        """Sum the latest investment balances (excluding Wealthfront Cash since it's liquid)"""
         wealthfront_cash_account = self.portfolio_repo.get_account_by_name("Wealthfront Cash")
         wealthfront_cash_id = wealthfront_cash_account.id if wealthfront_cash_account else None
         
         latest_balances = self.portfolio_repo.get_latest_balances()
-        investment_assets = sum(
+        return sum(
             float(balance.balance_amount) 
             for account_id, balance in latest_balances.items()
             if account_id != wealthfront_cash_id
         )
-        
+    
+    def combine_net_worth(self, liquid_assets: float, investment_assets: float) -> Dict:
+        """Build the net worth breakdown from liquid and investment totals"""
         total_net_worth = liquid_assets + investment_assets
         liquidity_ratio = liquid_assets / total_net_worth if total_net_worth > 0 else 0
         
@@ -130,22 +136,21 @@ class FinancialMetricsService:
         Returns monthly data points with actual bank balance data (not fabricated).
 
         Args:
-            period: Time period ("6m", "1y", "2y", "all")
+            period: Time period ("6m", "1y", "2y", "5y", "all")
 
         Returns:
             List of monthly data points with real values
         """
+        return list(self.iter_historical_net_worth(period))
+
+    def iter_historical_net_worth(self, period: str = "2y") -> Iterator[Dict]:
+        """
+        Yield the monthly data points of get_historical_net_worth one at a time.
+        """
         end_date = date.today()
 
         # Determine start date based on period
-        if period == "6m":
-            start_date = end_date - timedelta(days=180)
-        elif period == "1y":
-            start_date = end_date - timedelta(days=365)
-        elif period == "2y":
-            start_date = end_date - timedelta(days=730)
-        else:  # "all"
-            start_date = date(2020, 1, 1)
+        start_date = period_start_date(end_date, period)
 
         # Get all bank balances and organize by month
         all_bank_balances = self.bank_repo.get_all_balances()
@@ -162,9 +167,25 @@ class FinancialMetricsService:
         wealthfront_cash_account = self.portfolio_repo.get_account_by_name("Wealthfront Cash")
         wealthfront_cash_id = wealthfront_cash_account.id if wealthfront_cash_account else None
 
+        # Load each account's balance history once (ascending by date) instead of
+        # re-querying every account for every month
+        last_month_end = self._get_month_end_date(end_date.replace(day=1))
+        account_histories = [
+            (account.id, self.portfolio_repo.get_balances_for_account(
+                account.id,
+                start_date=date(2020, 1, 1),
+                end_date=last_month_end
+            ))
+            for account in accounts
+        ]
+        # Per account: index of the next unseen balance and the latest balance so far
+        next_index = [0] * len(account_histories)
+        latest_value = [None] * len(account_histories)
+
         # Build monthly data points
-        monthly_data = []
         current_date = start_date.replace(day=1)
+        # Months are walked in order, so the latest earlier bank total can be carried forward
+        latest_bank_total = Decimal('0')
 
         while current_date <= end_date:
             month_end = self._get_month_end_date(current_date)
@@ -172,37 +193,27 @@ class FinancialMetricsService:
             month_display = current_date.strftime('%b %Y')
 
             # Get bank balances for this month (or latest available)
-            bank_total = Decimal('0')
             if month_key in bank_by_month:
                 # Use exact month data if available
-                for account_name, balance in bank_by_month[month_key].items():
-                    bank_total += balance
-            else:
-                # Find the latest bank balance before this month
-                latest_bank_total = Decimal('0')
-                for mk in sorted(bank_by_month.keys()):
-                    if mk <= month_key:
-                        latest_bank_total = sum(bank_by_month[mk].values(), Decimal('0'))
-                bank_total = latest_bank_total
-
-            # Get portfolio balances for this month
+                latest_bank_total = sum(bank_by_month[month_key].values(), Decimal('0'))
+            bank_total = latest_bank_total
+
+            # Get portfolio balances for this month - advance each account's cursor
+            # past the balances dated on or before the month end
             portfolio_total = Decimal('0')
             wealthfront_cash = Decimal('0')
             investment_assets = Decimal('0')
 
-            for account in accounts:
-                account_balances = self.portfolio_repo.get_balances_for_account(
-                    account.id,
-                    start_date=date(2020, 1, 1),
-                    end_date=month_end
-                )
+            for i, (account_id, account_balances) in enumerate(account_histories):
+                while next_index[i] < len(account_balances) and account_balances[next_index[i]].balance_date <= month_end:
+                    latest_value[i] = account_balances[next_index[i]].balance_amount
+                    next_index[i] += 1
 
-                if account_balances:
-                    latest_balance = max(account_balances, key=lambda b: b.balance_date)
-                    balance_value = latest_balance.balance_amount
+                if latest_value[i] is not None:
+                    balance_value = latest_value[i]
                     portfolio_total += balance_value
 
-                    if account.id == wealthfront_cash_id:
+                    if account_id == wealthfront_cash_id:
                         wealthfront_cash = balance_value
                     else:
                         investment_assets += balance_value
@@ -211,7 +222,7 @@ class FinancialMetricsService:
             liquid_assets = bank_total + wealthfront_cash
             net_worth = bank_total + portfolio_total
 
-            monthly_data.append({
+            yield {
                 'month': month_display,
                 'date': current_date.strftime('%Y-%m-%d'),
                 'net_worth': float(net_worth),
@@ -219,7 +230,7 @@ class FinancialMetricsService:
                 'investment_assets': float(investment_assets),
                 'bank_balance': float(bank_total),
                 'wealthfront_cash': float(wealthfront_cash)
-            })
+            }
 
             # Move to next month
             if current_date.month == 12:
@@ -227,8 +238,6 @@ class FinancialMetricsService:
             else:
                 current_date = current_date.replace(month=current_date.month + 1)
 
-        return monthly_data
-
     def _get_month_end_date(self, month_start: date) -> date:
         """Get the last day of the month for a given month start date"""
         if month_start.month == 12:
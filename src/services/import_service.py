@@ -7,7 +7,7 @@ Import service for processing financial data files.
 import os
 import pandas as pd
 from decimal import Decimal
-from typing import Dict, Set, Optional, Tuple, List
+from typing import Dict, Set, Optional, Tuple, List, Union, BinaryIO
 from datetime import date
 
 from src.models.models import Transaction, Category, MonthlySummary
@@ -108,14 +108,17 @@ class ImportService:
         # Return the base amount for regular transactions
         return Decimal(str(base_amount))
     
-    def process_bank_file(self, file_path: str, original_filename: str = None) -> pd.DataFrame:
+    def process_bank_file(self, file_path: Union[str, BinaryIO], original_filename: str = None) -> pd.DataFrame:
         """
         Process a bank transaction file - updated for rank-based duplicate detection
+        
+        file_path may be a path or an open binary file (e.g. an upload's spooled file),
+        in which case original_filename is needed for bank detection.
         """
         # SAFETY FIX: Handle filename properly
         if original_filename and isinstance(original_filename, str) and original_filename.strip():
             filename_to_check = original_filename.lower()
-        elif file_path:
+        elif isinstance(file_path, str) and file_path:
             filename_to_check = os.path.basename(file_path).lower()
         else:
             raise ValueError("No valid filename provided for bank type detection")
@@ -111,7 +111,9 @@ class PDFProcessor:
             logger.debug(f"PDF has {total_pages} pages")
             
             # FIXED: Analyze ALL pages instead of just first 3
-            page_scores = {}
+            # Only the best page so far is kept, so other pages' OCR text is freed as we go
+            best_page = None
+            best_data = None
             
             # Score each page for financial content
             for page_num in range(total_pages):
@@ -121,12 +123,15 @@ class PDFProcessor:
                         financial_score = self._score_page_for_financial_content(page_text)
                         total_score = (page_confidence * 0.3) + (financial_score * 0.7)  # Weight financial content higher
                         
-                        page_scores[page_num + 1] = {
-                            'text': page_text,
-                            'confidence': page_confidence,
-                            'financial_score': financial_score,
-                            'total_score': total_score
-                        }
+                        # Strictly greater keeps the earliest page on ties
+                        if best_data is None or total_score > best_data['total_score']:
+                            best_page = page_num + 1
+                            best_data = {
+                                'text': page_text,
+                                'confidence': page_confidence,
+                                'financial_score': financial_score,
+                                'total_score': total_score
+                            }
                         
                         logger.debug(f"Page {page_num + 1}: confidence={page_confidence:.2f}, financial_score={financial_score:.2f}, total={total_score:.2f}")
                     
@@ -134,14 +139,10 @@ class PDFProcessor:
                     logger.warning(f"Error processing page {page_num + 1}: {str(e)}")
                     continue
             
-            if not page_scores:
+            if best_data is None:
                 logger.error("No pages could be processed")
                 return "", 0.0, 1, total_pages
             
-            # Find the best page
-            best_page = max(page_scores.keys(), key=lambda k: page_scores[k]['total_score'])
-            best_data = page_scores[best_page]
-            
             logger.debug(f"Best page: {best_page} with score {best_data['total_score']:.2f}")
             
             return (
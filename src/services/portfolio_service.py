@@ -25,15 +25,21 @@ from src.models.portfolio_models import (
     PortfolioOverview, AccountPerformance, InstitutionSummary, 
     AccountTypeSummary, PortfolioTrends, InvestmentAccount,
     PortfolioBalance, AccountType, ACCOUNT_TRANSACTION_MAPPING,
-    INVESTMENT_TRANSACTION_CATEGORIES
+    INVESTMENT_TRANSACTION_CATEGORIES, period_start_date
 )
 from src.repositories.portfolio_repository import PortfolioRepository
 from src.repositories.transaction_repository import TransactionRepository
+from src.utils.ttl_cache import TTLCache
 
 
 class PortfolioService:
     """Service for portfolio analysis and performance calculations"""
     
+    # Overview results are reused for this many seconds (and dropped on any balance or
+    # transaction write made in this process; other uvicorn workers keep theirs until the TTL)
+    OVERVIEW_CACHE_TTL = 60
+    OVERVIEW_CACHE_SIZE = 32
+    
     def __init__(
         self,
         portfolio_repository: PortfolioRepository,
@@ -41,6 +47,8 @@ class PortfolioService:
     ):
         self.portfolio_repo = portfolio_repository
         self.transaction_repo = transaction_repository
+        # (as_of_date, balance_version, transaction write_version) -> PortfolioOverview
+        self._overview_cache = TTLCache(self.OVERVIEW_CACHE_TTL, self.OVERVIEW_CACHE_SIZE)
     
     def get_portfolio_overview(self, as_of_date: Optional[date] = None) -> PortfolioOverview:
         """
@@ -55,6 +63,25 @@ class PortfolioService:
         if as_of_date is None:
             as_of_date = date.today()
         
+        # /overview and /institutions both need the full aggregation, so it is memoized
+        # per date; growth uses deposits from investment transactions, so the key carries
+        # both repositories' write counters and any balance or transaction write is a miss
+        return self._overview_cache.get_or_set(
+            (as_of_date, self.portfolio_repo.balance_version, self.transaction_repo.write_version),
+            lambda: self._build_portfolio_overview(as_of_date)
+        )
+    
+    def get_institution_summary(self, as_of_date: Optional[date] = None) -> List[InstitutionSummary]:
+        """
+        Get account performance grouped by institution
+        
+        Institution growth depends on each account's deposit estimate, so this reads the
+        (memoized) overview rather than aggregating balances separately.
+        """
+        return self.get_portfolio_overview(as_of_date).by_institution
+    
+    def _build_portfolio_overview(self, as_of_date: date) -> PortfolioOverview:
+        """Aggregate account performance into a PortfolioOverview (uncached)"""
         # Get all accounts
         accounts = self.portfolio_repo.get_all_accounts()
         
@@ -191,16 +218,7 @@ class PortfolioService:
         """
         end_date = date.today()
         
-        if period == "6m":
-            start_date = end_date - timedelta(days=180)
-        elif period == "1y": 
-            start_date = end_date - timedelta(days=365)
-        elif period == "2y":
-            start_date = end_date - timedelta(days=730)
-        elif period == "5y":
-            start_date = end_date - timedelta(days=1825)
-        else:  # "all"
-            start_date = date(2020, 1, 1)  # Show full timeline
+        start_date = period_start_date(end_date, period)
         
         accounts = self.portfolio_repo.get_all_accounts()
         monthly_values = []
@@ -0,0 +1,83 @@
+"""
+Small in-process TTL cache for the Finance Tracker application.
+"""
+
+import time
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+_MISSING = object()
+
+
+class TTLCache:
+    """
+    Dict-backed cache whose entries expire ttl seconds after they are stored.
+
+    Holds at most maxsize entries: when full, expired entries are dropped first,
+    then the oldest one.
+    """
+
+    def __init__(self, ttl: float, maxsize: int):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._entries: Dict[Hashable, Tuple[float, Any]] = {}
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Get the value stored for key if it has not expired.
+
+        Args:
+            key: Cache key
+            default: Returned when key is missing or expired
+
+        Returns:
+            The cached value, or default
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return default
+
+        if time.monotonic() - entry[0] >= self.ttl:
+            self._entries.pop(key, None)
+            return default
+
+        return entry[1]
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """
+        Store value for key, evicting expired (then oldest) entries if the cache is full.
+
+        Args:
+            key: Cache key
+            value: Value to store
+        """
+        now = time.monotonic()
+        self._entries.pop(key, None)
+
+        if len(self._entries) >= self.maxsize:
+            for stale_key in [k for k, (stored_at, _) in self._entries.items() if now - stored_at >= self.ttl]:
+                del self._entries[stale_key]
+            if len(self._entries) >= self.maxsize:
+                del self._entries[next(iter(self._entries))]
+
+        self._entries[key] = (now, value)
+
+    def get_or_set(self, key: Hashable, build: Callable[[], Any]) -> Any:
+        """
+        Get the cached value for key, calling build() and storing its result on a miss.
+
+        Args:
+            key: Cache key
+            build: Zero-argument function producing the value
+
+        Returns:
+            The cached or newly built value
+        """
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = build()
+            self.set(key, value)
+        return value
+
+    def clear(self) -> None:
+        """Drop every entry"""
+        self._entries.clear()